@@ -13,6 +13,8 @@ class ApprovalWorkflowSerializer(serializers.ModelSerializer):
 class ApprovalWorkflowListView(generics.ListAPIView):
     serializer_class = ApprovalWorkflowSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['name', 'approval_type', 'created_at']
+    ordering = ['-created_at']
 
     def get_queryset(self):
         return ApprovalWorkflow.objects.filter(
@@ -0,0 +1,56 @@
+"""
+Common logging handlers following SOLID principles.
+
+This module provides handlers that follow:
+- Single Responsibility: Each handler owns one log destination
+- Open/Closed: Configured from settings.LOGGING like the stdlib handlers
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    File handler that writes from a background thread.
+
+    Records are formatted on the logging thread and put on an in-memory
+    queue; a QueueListener thread appends them to the file, so requests
+    never block on disk writes. Forked children (gunicorn and Celery
+    workers) don't inherit the listener thread, so each child starts its
+    own on a fresh queue.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        # The logs directory isn't tracked, so create it on first start
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self.file_handler = logging.FileHandler(filename, mode, encoding, delay)
+        super().__init__(queue.SimpleQueue())
+        self.listener = None
+        self._start_listener()
+        os.register_at_fork(after_in_child=self._restart_in_child)
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        """Start draining the queue into the file."""
+        self.listener = QueueListener(self.queue, self.file_handler)
+        self.listener.start()
+
+    def _stop_listener(self):
+        """Flush the queued records and stop the listener thread."""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_in_child(self):
+        """Replace the parent's queue and (not inherited) listener thread."""
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
+
+    def close(self):
+        """Stop the listener and close the file."""
+        self._stop_listener()
+        self.file_handler.close()
+        super().close()
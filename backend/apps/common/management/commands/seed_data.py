@@ -318,12 +318,10 @@ class Command(BaseCommand):
             return
 
         # Get projects
-        projects = Project.objects.filter(organization=employee.organization)
-        if not projects.exists():
+        project = Project.objects.filter(organization=employee.organization).first()
+        if project is None:
             return
 
-        project = projects.first()
-
         # Create time entries for the last 7 days
         for i in range(7):
             entry_date = date.today() - timedelta(days=i)
@@ -12,6 +12,17 @@ from django.db import models
 from django.utils import timezone
 
 
+class SubqueryCount(models.Subquery):
+    """
+    Correlated ``COUNT(*)`` over a subquery.
+
+    Counts related rows without joining them into the outer query, so
+    several counts can be annotated on one row without multiplying it.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = models.IntegerField()
+
+
 class TimestampedModel(models.Model):
     """
     Abstract base model that provides timestamps.
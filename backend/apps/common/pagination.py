@@ -0,0 +1,24 @@
+"""
+Common pagination classes following SOLID principles.
+
+This module provides pagination that follows:
+- Single Responsibility: Each class handles one paging strategy
+- Open/Closed: Views pick a class and supply their own ordering
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Default pagination for the API list endpoints.
+
+    Pages are fetched with a keyset WHERE on the ordering instead of an
+    OFFSET, and no COUNT(*) is run. The ordering comes from the view's
+    ``ordering`` (through OrderingFilter), so views using this class must
+    declare one. The cursor is built from the sort values, so views must
+    also limit ``ordering_fields`` to non-null scalar columns; a NULL or a
+    relation would be encoded as a string the next page can't filter on.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,24 @@
+"""
+Common renderers following SOLID principles.
+
+This module provides renderers that follow:
+- Single Responsibility: Each renderer handles one media type
+- Open/Closed: Extends the orjson renderer without changing its output
+"""
+
+import orjson
+from drf_orjson_renderer.renderers import ORJSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class CompatibleORJSONRenderer(ORJSONRenderer):
+    """
+    orjson renderer producing the same JSON as DRF's JSONRenderer.
+
+    orjson encodes dicts, lists, strings, numbers and datetimes natively;
+    anything else (bare Decimals, timedeltas, querysets, lazy strings) goes
+    through DRF's own encoder, so e.g. summed Decimals stay numbers instead
+    of becoming strings.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    default = staticmethod(JSONEncoder().default)
@@ -0,0 +1,149 @@
+"""
+Common serializer helpers following SOLID principles.
+
+This module provides serializer mixins that follow:
+- Single Responsibility: Each mixin handles one serializer concern
+- Open/Closed: Mixed into app serializers without modifying DRF
+"""
+
+import copy
+from collections import OrderedDict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class CachedFieldsMixin:
+    """
+    Mixin that builds a serializer's field map once per class.
+
+    ModelSerializer introspects the model on every instantiation to build
+    its fields; this keeps the first result per class and hands each
+    instance shallow copies to bind. Only use it on flat serializers:
+    nested serializers and ListField children would be shared between copies,
+    so declaring one is rejected when the class is created. Read related
+    values through flat fields such as CharField(source='client.name').
+    """
+    _fields_cache = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, field in getattr(cls, '_declared_fields', {}).items():
+            if isinstance(field, (serializers.BaseSerializer, serializers.ListField)):
+                raise ImproperlyConfigured(
+                    f"{cls.__name__}.{name} is a nested field; {CachedFieldsMixin.__name__} "
+                    "serializers must declare flat fields only."
+                )
+
+    def get_fields(self):
+        """Return shallow copies of the cached field map."""
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {name: copy.copy(field) for name, field in self._fields_cache[cls].items()}
+
+
+class DynamicFieldsMixin:
+    """
+    Mixin that lets clients prune the response with ``?fields=a,b``.
+
+    Unknown names are ignored; without the parameter every declared
+    field is returned.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+
+        requested = request.query_params.get('fields')
+        if not requested:
+            return
+
+        allowed = {name.strip() for name in requested.split(',')}
+        for name in set(self.fields) - allowed:
+            self.fields.pop(name)
+
+
+class UpdateFieldsMixin:
+    """
+    Mixin that saves only the columns a ModelSerializer update wrote.
+
+    DRF's update() calls instance.save() with every column in the UPDATE
+    statement; this passes the validated fields (plus auto_now timestamps)
+    as update_fields instead. Many-to-many fields aren't supported.
+    """
+
+    def update(self, instance, validated_data):
+        """Set the validated fields and save just those columns."""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+
+        auto_now_fields = [
+            field.name for field in instance._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+        ]
+        instance.save(update_fields=[*validated_data, *auto_now_fields])
+        return instance
+
+
+class CompiledRepresentationMixin:
+    """
+    Mixin that precompiles a ModelSerializer's read path.
+
+    On first use the readable fields are resolved into a plan: fields whose
+    source is a plain concrete model column are read with a direct getattr,
+    everything else (dotted sources, methods, relations) keeps DRF's
+    get_attribute(). Each field's to_representation is bound up front, and
+    ReadOnlyField values are passed through as-is. Date-time fields get the
+    request's current timezone pinned instead of looking it up for every
+    value. A list response reuses one child serializer, so the plan is built
+    once per request instead of re-dispatching per row.
+    """
+
+    def get_representation_plan(self):
+        """Get (field_name, attribute, field, converter) tuples for the readable fields."""
+        if not hasattr(self, '_representation_plan'):
+            columns = {
+                model_field.name
+                for model_field in self.Meta.model._meta.concrete_fields
+                if not model_field.is_relation
+            }
+            plan = []
+            for field in self._readable_fields:
+                if isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone'):
+                    field.timezone = field.default_timezone()
+                plan.append((
+                    field.field_name,
+                    field.source if field.source in columns else None,
+                    field,
+                    None if type(field) is serializers.ReadOnlyField else field.to_representation,
+                ))
+            self._representation_plan = plan
+        return self._representation_plan
+
+    def to_representation(self, instance):
+        """Object instance -> Dict of primitive datatypes, following the plan."""
+        ret = OrderedDict()
+
+        for field_name, attribute_name, field, converter in self.get_representation_plan():
+            if attribute_name is not None:
+                attribute = getattr(instance, attribute_name)
+            else:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field_name] = None
+            elif converter is None:
+                ret[field_name] = attribute
+            else:
+                ret[field_name] = converter(attribute)
+
+        return ret
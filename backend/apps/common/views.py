@@ -6,6 +6,8 @@ This module provides common API views that follow:
 - Open/Closed: Extensible through inheritance
 """
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from django.http import JsonResponse
 from django.conf import settings
 from django.utils import timezone
@@ -13,6 +15,72 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 
 
+class SerializerPrefetchMixin:
+    """
+    Mixin that derives select_related/prefetch_related from the serializer.
+
+    Walks the source paths of the serializer's declared fields against the
+    queryset model: forward foreign keys are joined, reverse and many-to-many
+    relations (and anything beyond them) are prefetched. Views pass their
+    queryset through prefetch_serializer_relations() so new `source=` paths
+    don't reintroduce N+1 queries, and can narrow a prefetch by overriding
+    get_prefetch_queryset().
+    """
+    _relation_paths_cache = {}
+
+    def prefetch_serializer_relations(self, queryset):
+        """Apply the serializer's relation paths to queryset."""
+        select_paths, prefetch_paths = self.get_serializer_relation_paths(queryset.model)
+        if select_paths:
+            queryset = queryset.select_related(*select_paths)
+        if prefetch_paths:
+            queryset = queryset.prefetch_related(*[
+                Prefetch(path, queryset=self.get_prefetch_queryset(path))
+                for path in prefetch_paths
+            ])
+        return queryset
+
+    def get_prefetch_queryset(self, path):
+        """Get the queryset to prefetch path with (None for the default)."""
+        return None
+
+    def get_serializer_relation_paths(self, model):
+        """Get (select_related, prefetch_related) paths for the serializer."""
+        serializer_class = self.get_serializer_class()
+        cache_key = (serializer_class, model)
+        if cache_key not in self._relation_paths_cache:
+            select_paths, prefetch_paths = set(), set()
+            for name, field in serializer_class._declared_fields.items():
+                source = field.source or name
+                if source == '*':
+                    continue
+                joined, prefetched = self._split_relation_path(model, source.split('.'))
+                if prefetched:
+                    prefetch_paths.add('__'.join(joined + prefetched))
+                elif joined:
+                    select_paths.add('__'.join(joined))
+            self._relation_paths_cache[cache_key] = (sorted(select_paths), sorted(prefetch_paths))
+        return self._relation_paths_cache[cache_key]
+
+    @staticmethod
+    def _split_relation_path(model, attrs):
+        """Split attrs into the joinable prefix and the part that needs a prefetch."""
+        joined, prefetched = [], []
+        for attr in attrs:
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation or model_field.related_model is None:
+                break
+            if prefetched or model_field.one_to_many or model_field.many_to_many:
+                prefetched.append(attr)
+            else:
+                joined.append(attr)
+            model = model_field.related_model
+        return joined, prefetched
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def health_check(request):
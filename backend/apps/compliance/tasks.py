@@ -11,18 +11,20 @@ from celery import shared_task
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db.models import Count, Sum
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task
-def check_overtime_violations():
+def check_overtime_violations(user_id=None):
     """
     Check for overtime violations across all organizations.
 
-    This task runs periodically to identify users who may be
-    working excessive hours and trigger compliance alerts.
+    This task runs when a user's closed time entry is written (for that
+    user only) and as a periodic sweep over every user, to identify users
+    who may be working excessive hours and trigger compliance alerts.
     """
     try:
         logger.info("Starting overtime violations check...")
@@ -36,33 +38,36 @@ def check_overtime_violations():
         now = timezone.now()
         week_start = now - timedelta(days=now.weekday())
 
-        # Find users with potential overtime violations
-        overtime_users = []
-
-        # This is a basic implementation - you can enhance with more complex logic
+        # Total every active user's closed hours for the week in one grouped
+        # query, keeping those over 40 hours (configurable threshold)
         users = User.objects.filter(is_active=True)
+        entries = TimeEntry.objects.filter(
+            user__is_active=True,
+            clock_in__gte=week_start,
+            clock_in__lt=week_start + timedelta(days=7),
+            clock_out__isnull=False
+        )
+        if user_id is not None:
+            users = users.filter(pk=user_id)
+            entries = entries.filter(user_id=user_id)
+
+        week_totals = entries.with_worked_duration().values('user_id').annotate(
+            total=Sum('worked_duration')
+        ).order_by().filter(total__gt=timedelta(hours=40))
+
+        week_totals = list(week_totals)
+        users_by_id = User.objects.in_bulk([row['user_id'] for row in week_totals])
 
-        for user in users:
-            # Calculate total hours for current week
-            week_entries = TimeEntry.objects.filter(
-                user=user,
-                clock_in__gte=week_start,
-                clock_in__lt=week_start + timedelta(days=7),
-                clock_out__isnull=False
-            )
-
-            total_hours = sum([
-                (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                for entry in week_entries
-            ])
+        # Find users with potential overtime violations
+        overtime_users = []
 
-            # Check if exceeds 40 hours (configurable threshold)
-            if total_hours > 40:
-                overtime_users.append({
-                    'user': user,
-                    'total_hours': total_hours,
-                    'overtime_hours': total_hours - 40
-                })
+        for row in week_totals:
+            total_hours = row['total'].total_seconds() / 3600
+            overtime_users.append({
+                'user': users_by_id[row['user_id']],
+                'total_hours': total_hours,
+                'overtime_hours': total_hours - 40
+            })
 
         if overtime_users:
             logger.warning(f"Found {len(overtime_users)} users with potential overtime violations")
@@ -157,23 +162,27 @@ def generate_compliance_report():
         week_end = now - timedelta(days=now.weekday())
         week_start = week_end - timedelta(days=7)
 
-        reports_generated = 0
-
-        for org in Organization.objects.filter(is_active=True):
-            # Generate compliance metrics for the organization
-            entries = TimeEntry.objects.filter(
-                organization=org,
+        # Calculate every organization's metrics in one grouped query
+        metrics_by_org = {
+            row['organization_id']: row
+            for row in TimeEntry.objects.filter(
                 clock_in__gte=week_start,
                 clock_in__lt=week_end,
                 clock_out__isnull=False
-            )
-
-            # Calculate compliance metrics
-            total_entries = entries.count()
-            total_hours = sum([
-                (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                for entry in entries
-            ])
+            ).with_worked_duration().values('organization_id').annotate(
+                total_entries=Count('id'),
+                total=Sum('worked_duration')
+            ).order_by()
+        }
+
+        reports_generated = 0
+
+        for org in Organization.objects.filter(is_active=True).only('id', 'name'):
+            # Generate compliance metrics for the organization
+            metrics = metrics_by_org.get(org.id, {})
+            total_entries = metrics.get('total_entries', 0)
+            total = metrics.get('total')
+            total_hours = total.total_seconds() / 3600 if total else 0
 
             # You can expand this with more detailed compliance checks
             compliance_data = {
@@ -13,6 +13,8 @@ class ComplianceAlertSerializer(serializers.ModelSerializer):
 class ComplianceAlertListView(generics.ListAPIView):
     serializer_class = ComplianceAlertSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['alert_type', 'severity', 'created_at']
+    ordering = ['-created_at']
 
     def get_queryset(self):
         return ComplianceAlert.objects.filter(
@@ -16,6 +16,8 @@ class OrganizationDetailView(generics.RetrieveUpdateAPIView):
 class DepartmentListCreateView(generics.ListCreateAPIView):
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['name', 'code', 'status', 'created_at']
+    ordering = ['name']
 
     def get_queryset(self):
         return Department.objects.filter(
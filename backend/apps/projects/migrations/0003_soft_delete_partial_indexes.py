@@ -0,0 +1,20 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["project"],
+                name="task_active_by_project",
+            ),
+        ),
+    ]
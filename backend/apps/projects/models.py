@@ -9,10 +9,11 @@ This module provides project-related models that follow:
 - Dependency Inversion: Abstract project interface
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
-from apps.common.models import OrganizationScopedModel, StatusChoicesMixin
+from decimal import Decimal
+from apps.common.models import OrganizationScopedModel, StatusChoicesMixin, SubqueryCount
 
 
 class Client(OrganizationScopedModel, StatusChoicesMixin):
@@ -74,6 +75,8 @@ class Client(OrganizationScopedModel, StatusChoicesMixin):
     # Notes and documentation
     notes = models.TextField(blank=True)
 
+    STATUS_CHOICE_MAP = dict(StatusChoicesMixin.STATUS_CHOICES)
+
     class Meta:
         verbose_name = 'Client'
         verbose_name_plural = 'Clients'
@@ -86,6 +89,10 @@ class Client(OrganizationScopedModel, StatusChoicesMixin):
     def __str__(self):
         return self.name
 
+    def get_status_display(self):
+        """Get status label without rebuilding the choices dict."""
+        return self.STATUS_CHOICE_MAP.get(self.status, self.status)
+
     @property
     def active_projects_count(self):
         """Get count of active projects for this client."""
@@ -120,6 +127,32 @@ class ProjectCategory(OrganizationScopedModel):
         return self.name
 
 
+class ProjectQuerySet(models.QuerySet):
+    """
+    Project queryset with reusable annotations.
+    """
+
+    def with_counts(self):
+        """Annotate team, task and team member counts as subqueries."""
+        project = models.OuterRef('pk')
+        return self.annotate(
+            team_count=SubqueryCount(
+                Team.objects.filter(assigned_projects=project, is_active=True).values('pk')
+            ),
+            task_count=SubqueryCount(
+                Task.objects.filter(project=project, is_active=True, is_deleted=False).values('pk')
+            ),
+            team_members_count=SubqueryCount(
+                ProjectMembership.objects.filter(
+                    project=project,
+                    is_active=True,
+                    user__is_active=True,
+                    user__is_deleted=False
+                ).values('pk')
+            )
+        )
+
+
 class Project(OrganizationScopedModel, StatusChoicesMixin):
     """
     Main project model.
@@ -135,6 +168,7 @@ class Project(OrganizationScopedModel, StatusChoicesMixin):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    STATUS_CHOICE_MAP = dict(PROJECT_STATUS_CHOICES)
 
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -234,6 +268,8 @@ class Project(OrganizationScopedModel, StatusChoicesMixin):
     # Active status
     is_active = models.BooleanField(default=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Project'
         verbose_name_plural = 'Projects'
@@ -249,6 +285,10 @@ class Project(OrganizationScopedModel, StatusChoicesMixin):
     def __str__(self):
         return self.name
 
+    def get_status_display(self):
+        """Get status label without rebuilding the choices dict."""
+        return self.STATUS_CHOICE_MAP.get(self.status, self.status)
+
     @property
     def is_overdue(self):
         """Check if project is overdue."""
@@ -260,9 +300,7 @@ class Project(OrganizationScopedModel, StatusChoicesMixin):
     @property
     def total_hours_logged(self):
         """Get total hours logged on this project."""
-        from apps.time_tracking.models import TimeEntry
-        return TimeEntry.objects.filter(
-            project=self,
+        return self.time_entries.filter(
             is_deleted=False
         ).aggregate(
             total=models.Sum('total_hours')
@@ -290,17 +328,47 @@ class Project(OrganizationScopedModel, StatusChoicesMixin):
             projectmembership__is_active=True
         )
 
-    def can_user_log_time(self, user):
-        """Check if user can log time to this project."""
+    def can_user_log_time(self, user, membership_pairs=None):
+        """
+        Check if user can log time to this project.
+
+        ``membership_pairs`` may be a preloaded set of ``(project_id, user_id)``
+        tuples for current memberships; when given no query is issued.
+        """
         if not self.allow_time_tracking or not self.is_active:
             return False
 
         # Project manager can always log time
-        if self.project_manager == user:
+        if self.project_manager_id == user.id:
             return True
 
-        # Team members can log time
-        return self.team_members.filter(id=user.id).exists()
+        # Current team members can log time
+        if membership_pairs is not None:
+            return (self.pk, user.pk) in membership_pairs
+
+        return ProjectMembership.objects.current_for(user, self)
+
+
+class ProjectMembershipQuerySet(models.QuerySet):
+    """
+    Project membership queryset with current-membership lookups.
+    """
+
+    def current(self, today=None):
+        """Filter to memberships active on the given day (default today)."""
+        if today is None:
+            today = timezone.now().date()
+
+        return self.filter(
+            is_active=True,
+            start_date__lte=today
+        ).filter(
+            models.Q(end_date__isnull=True) | models.Q(end_date__gte=today)
+        )
+
+    def current_for(self, user, project, today=None):
+        """Check in one query whether user is currently a member of project."""
+        return self.filter(user=user, project=project).current(today).exists()
 
 
 class ProjectMembership(OrganizationScopedModel):
@@ -346,6 +414,8 @@ class ProjectMembership(OrganizationScopedModel):
     can_edit_project = models.BooleanField(default=False)
     can_manage_team = models.BooleanField(default=False)
 
+    objects = ProjectMembershipQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Project Membership'
         verbose_name_plural = 'Project Memberships'
@@ -423,6 +493,8 @@ class Team(OrganizationScopedModel, StatusChoicesMixin):
     max_members = models.PositiveIntegerField(default=50)
     is_public = models.BooleanField(default=True)
 
+    STATUS_CHOICE_MAP = dict(StatusChoicesMixin.STATUS_CHOICES)
+
     class Meta:
         verbose_name = 'Team'
         verbose_name_plural = 'Teams'
@@ -436,6 +508,10 @@ class Team(OrganizationScopedModel, StatusChoicesMixin):
     def __str__(self):
         return self.name
 
+    def get_status_display(self):
+        """Get status label without rebuilding the choices dict."""
+        return self.STATUS_CHOICE_MAP.get(self.status, self.status)
+
     @property
     def member_count(self):
         """Get current number of active members."""
@@ -463,18 +539,22 @@ class Team(OrganizationScopedModel, StatusChoicesMixin):
 
     def add_member(self, user, role='member', allocation_percentage=100):
         """Add a user to the team."""
-        if not self.can_add_member():
-            raise ValueError("Team has reached maximum capacity")
-
-        team_member, created = TeamMember.objects.get_or_create(
-            team=self,
-            user=user,
-            defaults={
-                'organization': self.organization,
-                'role': role,
-                'allocation_percentage': allocation_percentage,
-            }
-        )
+        with transaction.atomic():
+            # Lock the team row so concurrent adds can't overshoot max_members
+            Team.objects.select_for_update().only('id').get(pk=self.pk)
+
+            if not self.can_add_member():
+                raise ValueError("Team has reached maximum capacity")
+
+            team_member, created = TeamMember.objects.get_or_create(
+                team=self,
+                user=user,
+                defaults={
+                    'organization_id': self.organization_id,
+                    'role': role,
+                    'allocation_percentage': allocation_percentage,
+                }
+            )
         return team_member
 
     def remove_member(self, user):
@@ -488,6 +568,22 @@ class Team(OrganizationScopedModel, StatusChoicesMixin):
             pass
 
 
+class TeamMemberQuerySet(models.QuerySet):
+    """
+    Team member queryset with a projection for TeamMemberSerializer.
+    """
+
+    def for_serializer(self):
+        """Join user and team and load only the columns the serializer reads."""
+        return self.select_related('user', 'team').only(
+            'id', 'organization', 'team', 'user', 'role', 'start_date', 'end_date',
+            'allocation_percentage', 'is_active', 'can_view_all_projects',
+            'can_create_projects', 'can_manage_members', 'created_at', 'updated_at',
+            'user__first_name', 'user__last_name', 'user__email',
+            'team__name', 'team__team_lead'
+        )
+
+
 class TeamMember(OrganizationScopedModel):
     """
     Team membership model for user-team relationships.
@@ -530,6 +626,8 @@ class TeamMember(OrganizationScopedModel):
     can_create_projects = models.BooleanField(default=False)
     can_manage_members = models.BooleanField(default=False)
 
+    objects = TeamMemberQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Team Member'
         verbose_name_plural = 'Team Members'
@@ -562,13 +660,55 @@ class TeamMember(OrganizationScopedModel):
     @property
     def is_team_lead(self):
         """Check if user is the team lead."""
-        return self.team.team_lead == self.user
+        return self.team.team_lead_id == self.user_id
 
     def can_manage_team(self):
         """Check if user can manage team settings."""
         return self.is_team_lead or self.can_manage_members
 
 
+class TaskQuerySet(models.QuerySet):
+    """
+    Task queryset with SQL versions of the computed task properties.
+    """
+
+    def with_computed_fields(self):
+        """Annotate is_overdue, is_completed, hours_variance and completion_percentage."""
+        return self.annotate(
+            is_overdue_db=models.Case(
+                models.When(
+                    models.Q(due_date__lt=timezone.now().date())
+                    & ~models.Q(status__in=Task.CLOSED_STATUSES),
+                    then=models.Value(True)
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField()
+            ),
+            is_completed_db=models.ExpressionWrapper(
+                models.Q(status='done'),
+                output_field=models.BooleanField()
+            ),
+            hours_variance_db=models.Case(
+                models.When(
+                    models.Q(estimated_hours__isnull=False)
+                    & ~models.Q(estimated_hours=0)
+                    & ~models.Q(actual_hours=0),
+                    then=models.F('actual_hours') - models.F('estimated_hours')
+                ),
+                default=None,
+                output_field=models.DecimalField(max_digits=8, decimal_places=2)
+            ),
+            completion_percentage_db=models.Case(
+                *[
+                    models.When(status=status, then=models.Value(progress))
+                    for status, progress in Task.STATUS_PROGRESS_MAP.items()
+                ],
+                default=models.Value(0),
+                output_field=models.IntegerField()
+            )
+        )
+
+
 class Task(OrganizationScopedModel, StatusChoicesMixin):
     """
     Task model for project task management.
@@ -584,6 +724,17 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
         ('cancelled', 'Cancelled'),
     ]
 
+    CLOSED_STATUSES = ['done', 'cancelled']
+
+    STATUS_PROGRESS_MAP = {
+        'todo': 0,
+        'in_progress': 25,
+        'review': 75,
+        'testing': 90,
+        'done': 100,
+        'cancelled': 0,
+    }
+
     PRIORITY_CHOICES = [
         ('low', 'Low'),
         ('medium', 'Medium'),
@@ -659,6 +810,8 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
     # Active status
     is_active = models.BooleanField(default=True)
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
@@ -669,6 +822,11 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
             models.Index(fields=['priority', 'status']),
             models.Index(fields=['created_by']),
             models.Index(fields=['parent_task']),
+            models.Index(
+                fields=['project'],
+                condition=models.Q(is_deleted=False),
+                name='task_active_by_project'
+            ),
         ]
 
     def __str__(self):
@@ -677,7 +835,7 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
     @property
     def is_overdue(self):
         """Check if task is overdue."""
-        if self.due_date and self.status not in ['done', 'cancelled']:
+        if self.due_date and self.status not in self.CLOSED_STATUSES:
             return timezone.now().date() > self.due_date
         return False
 
@@ -696,15 +854,7 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
     @property
     def completion_percentage(self):
         """Get task completion percentage based on status."""
-        status_progress_map = {
-            'todo': 0,
-            'in_progress': 25,
-            'review': 75,
-            'testing': 90,
-            'done': 100,
-            'cancelled': 0,
-        }
-        return status_progress_map.get(self.status, 0)
+        return self.STATUS_PROGRESS_MAP.get(self.status, 0)
 
     def get_subtasks(self):
         """Get all active subtasks."""
@@ -712,11 +862,7 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
 
     def get_time_entries(self):
         """Get all time entries for this task."""
-        from apps.time_tracking.models import TimeEntry
-        return TimeEntry.objects.filter(
-            task=self,
-            is_deleted=False
-        )
+        return self.time_entries.filter(is_deleted=False)
 
     def update_actual_hours(self):
         """Update actual hours from time entries."""
@@ -747,22 +893,30 @@ class Task(OrganizationScopedModel, StatusChoicesMixin):
 
         self.save(update_fields=['status', 'completed_date', 'progress_percentage'])
 
-    def can_be_edited_by(self, user):
-        """Check if user can edit this task."""
+    def can_be_edited_by(self, user, managed_user_ids=None):
+        """
+        Check if user can edit this task.
+
+        ``managed_user_ids`` may be a precomputed set of ids the user can
+        manage; when given it replaces the per-task ``can_manage_user`` lookup.
+        """
         # Task assignee can edit
-        if self.assigned_to == user:
+        if self.assigned_to_id == user.id:
             return True
 
         # Task creator can edit
-        if self.created_by == user:
+        if self.created_by_id == user.id:
             return True
 
         # Project manager can edit
-        if self.project.project_manager == user:
+        if self.project.project_manager_id == user.id:
             return True
 
         # User with manage permissions can edit
-        if user.can_manage_user(self.assigned_to):
+        if managed_user_ids is not None:
+            return self.assigned_to_id in managed_user_ids
+
+        if self.assigned_to_id and user.can_manage_user(self.assigned_to):
             return True
 
-        return False
\ No newline at end of file
+        return False
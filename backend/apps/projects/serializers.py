@@ -1,25 +1,35 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from apps.common.serializers import CachedFieldsMixin, DynamicFieldsMixin
 from .models import Project, Client, ProjectCategory, ProjectMembership, Team, TeamMember, Task
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Client
-        fields = '__all__'
-        read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
+        fields = [
+            'id', 'name', 'email', 'phone', 'website', 'address_line1',
+            'address_line2', 'city', 'state', 'postal_code', 'country',
+            'industry', 'company_size', 'billing_rate', 'currency',
+            'payment_terms', 'primary_contact', 'account_manager', 'is_active',
+            'status', 'notes', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ProjectCategorySerializer(serializers.ModelSerializer):
+class ProjectCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProjectCategory
-        fields = '__all__'
-        read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
+        fields = [
+            'id', 'name', 'description', 'color', 'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.name', read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
-    project_manager_name = serializers.CharField(source='project_manager.get_full_name', read_only=True)
+    project_manager_name = serializers.SerializerMethodField()
     total_hours_logged = serializers.ReadOnlyField()
     budget_utilization = serializers.ReadOnlyField()
 
@@ -36,8 +46,37 @@ class ProjectSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
 
+    def get_project_manager_name(self, obj):
+        """Get project manager name, preferring the queryset annotation."""
+        if obj.project_manager_id is None:
+            return None
+        if hasattr(obj, 'project_manager_name'):
+            return obj.project_manager_name
+        return obj.project_manager.get_full_name()
+
+    def update(self, instance, validated_data):
+        """Update project, dropping the manager name annotation if it went stale."""
+        instance = super().update(instance, validated_data)
+        instance.__dict__.pop('project_manager_name', None)
+        return instance
+
+
+class ProjectListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """
+    Lean project serializer for list responses.
+    """
+    client_name = serializers.CharField(source='client.name', read_only=True)
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'name', 'code', 'client_name', 'status', 'priority',
+            'progress_percentage', 'is_active'
+        ]
+        read_only_fields = fields
+
 
-class ProjectMembershipSerializer(serializers.ModelSerializer):
+class ProjectMembershipSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
 
@@ -51,7 +90,7 @@ class ProjectMembershipSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Team serializer.
     """
@@ -69,7 +108,7 @@ class TeamSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Team member serializer.
     """
@@ -90,7 +129,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Task serializer.
     """
@@ -98,10 +137,10 @@ class TaskSerializer(serializers.ModelSerializer):
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     parent_task_title = serializers.CharField(source='parent_task.title', read_only=True)
-    is_overdue = serializers.ReadOnlyField()
-    is_completed = serializers.ReadOnlyField()
-    hours_variance = serializers.ReadOnlyField()
-    completion_percentage = serializers.ReadOnlyField()
+    is_overdue = serializers.SerializerMethodField()
+    is_completed = serializers.SerializerMethodField()
+    hours_variance = serializers.SerializerMethodField()
+    completion_percentage = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -116,6 +155,29 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'organization', 'actual_hours', 'created_at', 'updated_at']
 
+    def _get_computed(self, obj, name):
+        """Get a computed property, preferring the with_computed_fields() annotation."""
+        annotation = f'{name}_db'
+        if hasattr(obj, annotation):
+            return getattr(obj, annotation)
+        return getattr(obj, name)
+
+    def get_is_overdue(self, obj):
+        """Get whether the task is overdue."""
+        return self._get_computed(obj, 'is_overdue')
+
+    def get_is_completed(self, obj):
+        """Get whether the task is completed."""
+        return self._get_computed(obj, 'is_completed')
+
+    def get_hours_variance(self, obj):
+        """Get the variance between actual and estimated hours."""
+        return self._get_computed(obj, 'hours_variance')
+
+    def get_completion_percentage(self, obj):
+        """Get the status-based completion percentage."""
+        return self._get_computed(obj, 'completion_percentage')
+
     def create(self, validated_data):
         """Create task with current user as creator."""
         validated_data['created_by'] = self.context['request'].user
@@ -123,6 +185,52 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class TaskCreateListSerializer(serializers.ListSerializer):
+    """
+    List serializer for bulk task creation.
+
+    Loads the current memberships for every project and user in the payload
+    with one query, so each child's access checks become set lookups.
+    """
+
+    def run_validation(self, data=serializers.empty):
+        """Preload membership pairs before validating the children."""
+        if isinstance(data, list):
+            self.context['membership_pairs'] = self.get_membership_pairs(data)
+        return super().run_validation(data)
+
+    def get_membership_pairs(self, data):
+        """Get (project_id, user_id) pairs of current memberships in the payload."""
+        project_ids = set()
+        user_ids = {self.context['request'].user.pk}
+        for item in data:
+            if isinstance(item, dict):
+                project_ids.add(item.get('project'))
+                user_ids.add(item.get('assigned_to'))
+
+        return set(
+            ProjectMembership.objects.current().filter(
+                project_id__in=self._clean_ids(Project, project_ids),
+                user_id__in=self._clean_ids(
+                    ProjectMembership._meta.get_field('user').related_model, user_ids
+                )
+            ).values_list('project_id', 'user_id')
+        )
+
+    def _clean_ids(self, model, values):
+        """Coerce raw ids to the model's pk type, dropping invalid ones."""
+        pk_field = model._meta.pk
+        ids = set()
+        for value in values:
+            if value is None:
+                continue
+            try:
+                ids.add(pk_field.to_python(value))
+            except DjangoValidationError:
+                continue
+        return ids
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     """
     Task creation serializer with validation.
@@ -134,24 +242,26 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             'start_date', 'due_date', 'estimated_hours', 'status', 'priority',
             'is_billable', 'requires_approval', 'is_milestone'
         ]
+        list_serializer_class = TaskCreateListSerializer
 
     def validate(self, attrs):
         """Validate task data."""
         # Validate project access
         project = attrs.get('project')
         user = self.context['request'].user
+        membership_pairs = self.context.get('membership_pairs')
 
-        if project and not project.can_user_log_time(user):
+        if project and not project.can_user_log_time(user, membership_pairs):
             raise serializers.ValidationError("You don't have access to this project")
 
         # Validate parent task
         parent_task = attrs.get('parent_task')
-        if parent_task and parent_task.project != project:
+        if parent_task and parent_task.project_id != getattr(project, 'pk', None):
             raise serializers.ValidationError("Parent task must belong to the same project")
 
         # Validate assigned user
         assigned_to = attrs.get('assigned_to')
-        if assigned_to and project and not project.can_user_log_time(assigned_to):
+        if assigned_to and project and not project.can_user_log_time(assigned_to, membership_pairs):
             raise serializers.ValidationError("Assigned user doesn't have access to this project")
 
         return attrs
@@ -179,7 +289,8 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         """Validate task updates."""
         # Check if user can edit this task
         user = self.context['request'].user
-        if not self.instance.can_be_edited_by(user):
+        managed_user_ids = self.context.get('managed_user_ids')
+        if not self.instance.can_be_edited_by(user, managed_user_ids):
             raise serializers.ValidationError("You don't have permission to edit this task")
 
         return attrs
@@ -188,28 +299,18 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
 class ProjectDetailSerializer(ProjectSerializer):
     """
     Detailed project serializer with team and task counts.
+
+    The counts are read from ``ProjectQuerySet.with_counts()`` annotations.
     """
-    team_count = serializers.SerializerMethodField()
-    task_count = serializers.SerializerMethodField()
-    team_members_count = serializers.SerializerMethodField()
+    team_count = serializers.IntegerField(read_only=True)
+    task_count = serializers.IntegerField(read_only=True)
+    team_members_count = serializers.IntegerField(read_only=True)
 
     class Meta(ProjectSerializer.Meta):
         fields = ProjectSerializer.Meta.fields + [
             'team_count', 'task_count', 'team_members_count'
         ]
 
-    def get_team_count(self, obj):
-        """Get number of teams assigned to project."""
-        return obj.teams.filter(is_active=True).count()
-
-    def get_task_count(self, obj):
-        """Get number of tasks in project."""
-        return obj.tasks.filter(is_active=True, is_deleted=False).count()
-
-    def get_team_members_count(self, obj):
-        """Get number of team members in project."""
-        return obj.get_team_members().count()
-
 
 class ProjectAssignTeamSerializer(serializers.Serializer):
     """
@@ -223,22 +324,27 @@ class ProjectAssignTeamSerializer(serializers.Serializer):
     def validate_team_ids(self, value):
         """Validate team IDs."""
         organization = self.context['organization']
-        valid_teams = Team.objects.filter(
-            id__in=value,
-            organization=organization,
-            is_active=True,
-            is_deleted=False
+        team_ids = set(value)
+        valid_team_ids = set(
+            Team.objects.filter(
+                id__in=team_ids,
+                organization=organization,
+                is_active=True,
+                is_deleted=False
+            ).values_list('id', flat=True)
         )
 
-        if len(valid_teams) != len(value):
-            raise serializers.ValidationError("Some teams are not valid or don't exist")
+        invalid_team_ids = team_ids - valid_team_ids
+        if invalid_team_ids:
+            raise serializers.ValidationError(
+                f"Invalid teams: {', '.join(sorted(str(team_id) for team_id in invalid_team_ids))}"
+            )
 
-        return value
+        return list(team_ids)
 
     def save(self):
         """Assign teams to project."""
         project = self.context['project']
         team_ids = self.validated_data['team_ids']
-        teams = Team.objects.filter(id__in=team_ids)
-        project.teams.set(teams)
+        project.teams.set(team_ids)
         return project
\ No newline at end of file
@@ -1,42 +1,133 @@
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, JSONObject, Trim
+from django.http import Http404
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from apps.common.views import SerializerPrefetchMixin
 from .models import Project, Client, ProjectCategory
-from .serializers import ProjectSerializer, ClientSerializer, ProjectCategorySerializer
+from .serializers import (
+    ProjectSerializer, ProjectListSerializer, ProjectDetailSerializer, ClientSerializer,
+    ProjectCategorySerializer
+)
 
 
-class ProjectListCreateView(generics.ListCreateAPIView):
-    serializer_class = ProjectSerializer
-    permission_classes = [permissions.IsAuthenticated]
+class ProjectQuerySetMixin(SerializerPrefetchMixin):
+    """
+    Project queryset shared by the project views.
+
+    Joins the rows the serializer reads and loads only the serialized
+    columns, so a page of projects is served by a single query.
+    """
+    only_fields = [
+        'id', 'organization', 'name', 'description', 'code',
+        'client', 'client__name', 'department', 'department__name',
+        'category', 'project_manager', 'start_date', 'end_date', 'deadline',
+        'budget_hours', 'budget_amount', 'hourly_rate', 'is_billable',
+        'billing_type', 'status', 'priority', 'progress_percentage',
+        'is_active', 'is_deleted', 'deleted_at', 'created_at', 'updated_at',
+    ]
+
+    def get_only_fields(self):
+        """Get the project columns to load."""
+        return self.only_fields
 
     def get_queryset(self):
-        return Project.objects.filter(
+        queryset = Project.objects.filter(
             organization=self.request.user.organization,
             is_deleted=False
+        ).only(
+            *self.get_only_fields()
         )
+        if 'project_manager_name' in self.get_serializer_class()._declared_fields:
+            queryset = queryset.annotate(
+                project_manager_name=Trim(Concat(
+                    'project_manager__first_name',
+                    Value(' '),
+                    'project_manager__last_name'
+                ))
+            )
+        return self.prefetch_serializer_relations(queryset)
+
+
+class ProjectListCreateView(ProjectQuerySetMixin, generics.ListCreateAPIView):
+    serializer_class = ProjectSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = [
+        'name', 'code', 'status', 'priority', 'progress_percentage', 'created_at',
+    ]
+    ordering = ['name']
+    list_only_fields = [
+        'id', 'organization', 'name', 'code', 'client', 'client__name',
+        'status', 'priority', 'progress_percentage', 'is_active',
+        # Sortable, so the page cursor can read it
+        'created_at',
+    ]
+
+    def get_serializer_class(self):
+        """Use the lean list serializer for reads."""
+        if self.request.method == 'GET':
+            return ProjectListSerializer
+        return super().get_serializer_class()
+
+    def get_only_fields(self):
+        """Load only the list columns for reads."""
+        if self.request.method == 'GET':
+            return self.list_only_fields
+        return super().get_only_fields()
 
     def perform_create(self, serializer):
         serializer.save(organization=self.request.user.organization)
 
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
-    serializer_class = ProjectSerializer
+class ProjectDetailView(ProjectQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = ProjectDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Project.objects.filter(
-            organization=self.request.user.organization,
-            is_deleted=False
-        )
+        return super().get_queryset().with_counts()
 
+    def retrieve(self, request, *args, **kwargs):
+        """Return the project with its active memberships aggregated in SQL."""
+        project = self.get_queryset().filter(pk=kwargs['pk']).annotate(
+            memberships_json=JSONBAgg(
+                JSONObject(
+                    user_id='projectmembership__user_id',
+                    user_name=Concat(
+                        'projectmembership__user__first_name',
+                        Value(' '),
+                        'projectmembership__user__last_name'
+                    ),
+                    role='projectmembership__role',
+                    allocation='projectmembership__allocation_percentage',
+                ),
+                filter=Q(projectmembership__is_active=True),
+                # NULL without active members, as Django 5.0 returns by default
+                default=None
+            )
+        ).first()
 
-class ClientListCreateView(generics.ListCreateAPIView):
+        if project is None:
+            raise Http404
+
+        self.check_object_permissions(request, project)
+        data = self.get_serializer(project).data
+        data['memberships'] = project.memberships_json or []
+        return Response(data)
+
+
+class ClientListCreateView(SerializerPrefetchMixin, generics.ListCreateAPIView):
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['name', 'status', 'created_at']
+    ordering = ['name']
 
     def get_queryset(self):
-        return Client.objects.filter(
+        queryset = Client.objects.filter(
             organization=self.request.user.organization,
             is_deleted=False
-        )
+        ).only(*ClientSerializer.Meta.fields)
+        return self.prefetch_serializer_relations(queryset)
 
     def perform_create(self, serializer):
         serializer.save(organization=self.request.user.organization)
\ No newline at end of file
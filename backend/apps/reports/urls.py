@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path('', views.ReportListView.as_view(), name='report-list'),
-]
\ No newline at end of file
+    path('<uuid:pk>/', views.ReportDetailView.as_view(), name='report-detail'),
+]
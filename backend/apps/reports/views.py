@@ -1,4 +1,5 @@
 from rest_framework import generics, permissions
+from apps.common.views import SerializerPrefetchMixin
 from .models import Report
 from rest_framework import serializers
 
@@ -6,16 +7,42 @@ from rest_framework import serializers
 class ReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Report
-        fields = '__all__'
+        fields = [
+            'id', 'name', 'report_type', 'is_public', 'is_scheduled',
+            'schedule_frequency', 'next_run', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ReportDetailSerializer(ReportSerializer):
+    class Meta(ReportSerializer.Meta):
+        fields = ReportSerializer.Meta.fields + [
+            'organization', 'description', 'filters', 'columns', 'sort_order',
+            'created_by', 'shared_with'
+        ]
         read_only_fields = ['id', 'organization', 'created_at', 'updated_at']
 
 
-class ReportListView(generics.ListAPIView):
+class ReportListView(SerializerPrefetchMixin, generics.ListAPIView):
     serializer_class = ReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['name', 'report_type', 'created_at']
+    ordering = ['-created_at']
+
+    def get_queryset(self):
+        queryset = Report.objects.filter(
+            organization=self.request.user.organization,
+            is_deleted=False
+        ).only(*ReportSerializer.Meta.fields)
+        return self.prefetch_serializer_relations(queryset)
+
+
+class ReportDetailView(generics.RetrieveAPIView):
+    serializer_class = ReportDetailSerializer
+    permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Report.objects.filter(
             organization=self.request.user.organization,
             is_deleted=False
-        )
\ No newline at end of file
+        ).prefetch_related('shared_with')
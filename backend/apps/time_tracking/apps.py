@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class TimeTrackingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.time_tracking'
-    verbose_name = 'Time Tracking'
\ No newline at end of file
+    verbose_name = 'Time Tracking'
+
+    def ready(self):
+        # Register the cache invalidation signal handlers
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Cache helpers for the time tracking read endpoints.
+
+This module provides:
+- Cache keys for per-user responses
+- Invalidation used by signals and bulk writers
+"""
+
+from django.core.cache import cache
+from django.utils import timezone
+
+# Upper bound on staleness for writes that bypass invalidation
+ACTIVE_ENTRY_TIMEOUT = 300
+TIME_SUMMARY_TIMEOUT = 3600
+USER_STATS_TIMEOUT = 3600
+
+
+def active_entry_key(user_id):
+    """Get the cache key of a user's current time entry response."""
+    return f'active_entry:{user_id}'
+
+
+def time_summary_key(user_id, day):
+    """Get the cache key of a user's time summary as of day."""
+    return f'time_summary:{user_id}:{day.isoformat()}'
+
+
+def user_stats_key(user_id, day):
+    """Get the cache key of a user's stats for the month of day."""
+    return f'user_stats:{user_id}:{day:%Y-%m}'
+
+
+def invalidate_user_caches(*user_ids):
+    """Drop the cached current time entry, today's summary and this month's stats of the given users."""
+    today = timezone.now().date()
+    keys = []
+    for user_id in user_ids:
+        keys += [
+            active_entry_key(user_id),
+            time_summary_key(user_id, today),
+            user_stats_key(user_id, today),
+        ]
+    cache.delete_many(keys)
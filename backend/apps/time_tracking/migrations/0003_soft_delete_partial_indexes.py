@@ -0,0 +1,28 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["project"],
+                name="time_entry_live_by_project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["task"],
+                name="time_entry_live_by_task",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:38
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_unpaid_break_minutes(apps, schema_editor):
+    TimeEntry = apps.get_model("time_tracking", "TimeEntry")
+    BreakEntry = apps.get_model("time_tracking", "BreakEntry")
+    unpaid_minutes = (
+        BreakEntry.objects.filter(time_entry=models.OuterRef("pk"), is_paid=False)
+        .order_by()
+        .values("time_entry")
+        .annotate(total=models.Sum("duration_minutes"))
+        .values("total")
+    )
+    TimeEntry.objects.update(
+        unpaid_break_minutes=Coalesce(models.Subquery(unpaid_minutes), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0003_soft_delete_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timeentry",
+            name="unpaid_break_minutes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unpaid_break_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0004_timeentry_unpaid_break_minutes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="timeentry",
+            name="time_tracki_organiz_f43497_idx",
+        ),
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                fields=["organization", "date", "is_deleted"],
+                name="time_tracki_organiz_41541a_idx",
+            ),
+        ),
+    ]
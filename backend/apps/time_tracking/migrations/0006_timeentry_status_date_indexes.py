@@ -0,0 +1,25 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0005_timeentry_org_date_is_deleted_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                fields=["user", "status", "date"], name="time_tracki_user_id_568e53_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                fields=["organization", "status", "date"],
+                name="time_tracki_organiz_75aab6_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0006_timeentry_status_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timesheetperiod",
+            name="total_billable_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=12, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="timesheetperiod",
+            name="total_hours",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.15 on 2026-10-14 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0007_timesheetperiod_totals_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                condition=models.Q(("clock_out__isnull", True), ("is_deleted", False)),
+                fields=["user"],
+                name="time_entry_active_by_user",
+            ),
+        ),
+    ]
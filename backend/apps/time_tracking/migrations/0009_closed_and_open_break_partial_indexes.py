@@ -0,0 +1,28 @@
+# Generated by Django 4.2.15 on 2026-10-14 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0008_timeentry_active_by_user_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="breakentry",
+            index=models.Index(
+                condition=models.Q(("end_time__isnull", True)),
+                fields=["time_entry"],
+                name="break_entry_open_by_entry",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                condition=models.Q(("clock_out__isnull", False)),
+                fields=["organization", "clock_in"],
+                name="time_entry_closed_by_org",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.15 on 2026-10-14 18:11
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def soft_delete_extra_active_entries(apps, schema_editor):
+    # Keep each user's latest open entry; the read-then-insert clock in
+    # race could leave older ones behind, and they'd break the constraint
+    TimeEntry = apps.get_model("time_tracking", "TimeEntry")
+    newer_active = TimeEntry.objects.filter(
+        models.Q(clock_in__gt=models.OuterRef("clock_in"))
+        | models.Q(clock_in=models.OuterRef("clock_in"), pk__gt=models.OuterRef("pk")),
+        user=models.OuterRef("user"),
+        clock_out__isnull=True,
+        is_deleted=False,
+    )
+    now = timezone.now()
+    TimeEntry.objects.filter(
+        models.Exists(newer_active), clock_out__isnull=True, is_deleted=False
+    ).update(is_deleted=True, deleted_at=now, updated_at=now)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0009_closed_and_open_break_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            soft_delete_extra_active_entries, migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name="timeentry",
+            name="time_entry_active_by_user",
+        ),
+        migrations.AddConstraint(
+            model_name="timeentry",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("clock_out__isnull", True), ("is_deleted", False)),
+                fields=("user",),
+                name="time_entry_one_active_per_user",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.15 on 2026-10-14 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("time_tracking", "0010_timeentry_one_active_per_user"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="timeentry",
+            name="time_tracki_user_id_60c1d3_idx",
+        ),
+        migrations.AddIndex(
+            model_name="timeentry",
+            index=models.Index(
+                fields=["user", "date"],
+                include=("is_deleted", "clock_out", "total_hours", "overtime_hours"),
+                name="time_entry_user_date_totals",
+            ),
+        ),
+    ]
@@ -10,8 +10,11 @@ This module provides time tracking models that follow:
 """
 
 from django.db import models
+from django.core.exceptions import FieldDoesNotExist
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal
 from apps.common.models import OrganizationScopedModel, ApprovalStatusMixin
 
@@ -54,17 +57,83 @@ class BreakEntry(OrganizationScopedModel):
         indexes = [
             models.Index(fields=['time_entry', 'start_time']),
             models.Index(fields=['break_type']),
+            models.Index(
+                fields=['time_entry'],
+                condition=models.Q(end_time__isnull=True),
+                name='break_entry_open_by_entry'
+            ),
         ]
 
     def __str__(self):
         return f"{self.get_break_type_display()} - {self.start_time.strftime('%H:%M')}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the persisted unpaid minutes to diff against on save."""
+        instance = super().from_db(db, field_names, values)
+        if 'is_paid' in field_names and 'duration_minutes' in field_names:
+            instance._saved_unpaid_minutes = instance.unpaid_minutes
+        return instance
+
     def save(self, *args, **kwargs):
-        """Calculate duration if end_time is provided."""
+        """Calculate duration if end_time is provided and sync the time entry total."""
         if self.start_time and self.end_time and not self.duration_minutes:
-            duration = self.end_time - self.start_time
-            self.duration_minutes = int(duration.total_seconds() / 60)
+            self.duration_minutes = self.calculate_duration_minutes()
+        saved_minutes = self._get_saved_unpaid_minutes()
         super().save(*args, **kwargs)
+        self._saved_unpaid_minutes = self.unpaid_minutes
+        self._apply_unpaid_minutes_delta(self.unpaid_minutes - saved_minutes)
+
+    def calculate_duration_minutes(self):
+        """Calculate whole minutes between start and end time."""
+        if self.start_time and self.end_time:
+            return int((self.end_time - self.start_time).total_seconds() // 60)
+        return None
+
+    def end(self, end_time=None):
+        """End the break, writing only the columns that change."""
+        self.end_time = end_time or timezone.now()
+        self.duration_minutes = self.calculate_duration_minutes()
+        self.save(update_fields=['end_time', 'duration_minutes', 'updated_at'])
+
+    def hard_delete(self, using=None, keep_parents=False):
+        """Permanently delete the break and remove it from the time entry total."""
+        saved_minutes = self._get_saved_unpaid_minutes()
+        super().hard_delete(using=using, keep_parents=keep_parents)
+        self._apply_unpaid_minutes_delta(-saved_minutes)
+
+    def _get_saved_unpaid_minutes(self):
+        """Get the unpaid minutes currently counted for this break in the database."""
+        if self._state.adding:
+            return 0
+
+        if not hasattr(self, '_saved_unpaid_minutes'):
+            saved = BreakEntry.objects.filter(pk=self.pk).values('is_paid', 'duration_minutes').first()
+            if saved is None or saved['is_paid']:
+                return 0
+            return saved['duration_minutes'] or 0
+
+        return self._saved_unpaid_minutes
+
+    def _apply_unpaid_minutes_delta(self, delta):
+        """Adjust the parent's denormalized unpaid break minutes by delta."""
+        if not delta:
+            return
+
+        TimeEntry.objects.filter(pk=self.time_entry_id).update(
+            unpaid_break_minutes=models.F('unpaid_break_minutes') + delta
+        )
+
+        # Keep an already loaded parent in step with the row
+        if self._meta.get_field('time_entry').is_cached(self):
+            self.time_entry.unpaid_break_minutes += delta
+
+    @property
+    def unpaid_minutes(self):
+        """Get minutes this break subtracts from worked time."""
+        if self.is_paid:
+            return 0
+        return self.duration_minutes or 0
 
     @property
     def is_active(self):
@@ -79,6 +148,56 @@ class BreakEntry(OrganizationScopedModel):
         return Decimal('0.00')
 
 
+class TimeEntryQuerySet(models.QuerySet):
+    """
+    Time entry queryset with shared lookups.
+    """
+
+    def active_for(self, user):
+        """Filter to the user's live entries that are still clocked in."""
+        return self.filter(user=user, clock_out__isnull=True, is_deleted=False)
+
+    def with_worked_duration(self):
+        """Annotate worked_duration (clock_out - clock_in) for SQL-side sums."""
+        return self.annotate(worked_duration=models.F('clock_out') - models.F('clock_in'))
+
+    def stats_for(self, user_id, start, end):
+        """
+        Get a user's hours, project count and approval/attendance rates.
+
+        Covers the live entries dated start..end in one aggregate; attendance
+        is the share of weekdays in the range with at least one entry.
+        """
+        reviewed = models.Q(status__in=[self.model.APPROVED, self.model.REJECTED])
+        weekday = models.Q(date__week_day__in=[2, 3, 4, 5, 6])
+        totals = self.filter(
+            user_id=user_id,
+            date__gte=start,
+            date__lte=end,
+            is_deleted=False
+        ).aggregate(
+            total=Coalesce(models.Sum('total_hours'), Decimal('0.00')),
+            overtime=Coalesce(models.Sum('overtime_hours'), Decimal('0.00')),
+            projects=models.Count('project', distinct=True),
+            reviewed=models.Count('id', filter=reviewed),
+            approved=models.Count('id', filter=models.Q(status=self.model.APPROVED)),
+            days_worked=models.Count('date', distinct=True, filter=weekday),
+        )
+
+        weekdays = sum(
+            1 for offset in range((end - start).days + 1)
+            if (start + timedelta(days=offset)).weekday() < 5
+        )
+
+        return {
+            'total_hours_this_month': float(totals['total']),
+            'overtime_hours_this_month': float(totals['overtime']),
+            'projects_count': totals['projects'],
+            'approval_rate': round(100 * totals['approved'] / totals['reviewed'], 1) if totals['reviewed'] else 0.0,
+            'attendance_rate': round(100 * totals['days_worked'] / weekdays, 1) if weekdays else 0.0,
+        }
+
+
 class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
     """
     Main time entry model for tracking work time.
@@ -129,6 +248,9 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
     total_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     break_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
 
+    # Sum of unpaid break minutes, maintained by BreakEntry.save()
+    unpaid_break_minutes = models.PositiveIntegerField(default=0)
+
     # Billing information
     is_billable = models.BooleanField(default=True)
     hourly_rate = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
@@ -164,28 +286,98 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
     is_locked = models.BooleanField(default=False)
     requires_approval = models.BooleanField(default=True)
 
+    objects = TimeEntryQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Time Entry'
         verbose_name_plural = 'Time Entries'
         unique_together = ['user', 'date', 'clock_in']
+        constraints = [
+            # At most one running entry per user; also indexes the active lookup
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(clock_out__isnull=True, is_deleted=False),
+                name='time_entry_one_active_per_user'
+            ),
+        ]
         indexes = [
-            models.Index(fields=['user', 'date']),
+            # Covers the per-user daily/weekly totals (index-only scans)
+            models.Index(
+                fields=['user', 'date'],
+                include=['is_deleted', 'clock_out', 'total_hours', 'overtime_hours'],
+                name='time_entry_user_date_totals'
+            ),
             models.Index(fields=['project', 'date']),
             models.Index(fields=['task', 'date']),
-            models.Index(fields=['organization', 'date']),
+            models.Index(fields=['organization', 'date', 'is_deleted']),
+            models.Index(fields=['user', 'status', 'date']),
+            models.Index(fields=['organization', 'status', 'date']),
             models.Index(fields=['status']),
             models.Index(fields=['is_billable']),
+            models.Index(
+                fields=['project'],
+                condition=models.Q(is_deleted=False),
+                name='time_entry_live_by_project'
+            ),
+            models.Index(
+                fields=['task'],
+                condition=models.Q(is_deleted=False),
+                name='time_entry_live_by_task'
+            ),
+            models.Index(
+                fields=['organization', 'clock_in'],
+                condition=models.Q(clock_out__isnull=False),
+                name='time_entry_closed_by_org'
+            ),
         ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.date} ({self.total_hours}h)"
 
+    # Fields that feed calculate_hours() / calculate_billing()
+    HOURS_FIELDS = {
+        'clock_in', 'clock_out', 'break_hours', 'regular_hours',
+        'overtime_hours', 'total_hours',
+    }
+    BILLING_FIELDS = {
+        'hourly_rate', 'is_billable', 'regular_hours', 'overtime_hours',
+        'billable_amount',
+    }
+
     def save(self, *args, **kwargs):
-        """Calculate hours and amounts on save."""
-        self.calculate_hours()
-        self.calculate_billing()
+        """
+        Calculate hours and amounts on save.
+
+        Partial saves through ``update_fields`` only recompute when an input
+        of the calculation is among the updated fields, and then also write
+        the recomputed columns.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.calculate_hours()
+            self.calculate_billing()
+        else:
+            update_fields = set(update_fields)
+            if update_fields & self.HOURS_FIELDS:
+                self.calculate_hours()
+                update_fields |= {'break_hours', 'regular_hours', 'overtime_hours', 'total_hours'}
+            if update_fields & self.BILLING_FIELDS:
+                self.calculate_billing()
+                update_fields.add('billable_amount')
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
 
+    def get_compliance_settings(self):
+        """
+        Get the user's compliance settings, cached on the entry.
+
+        Querysets that re-save many entries should
+        ``select_related('user__compliance_settings')`` so this is free.
+        """
+        if not hasattr(self, '_compliance_settings'):
+            self._compliance_settings = self.user.compliance_settings if self.user_id else None
+        return self._compliance_settings
+
     def calculate_hours(self):
         """Calculate regular, overtime, and total hours."""
         if not self.clock_in:
@@ -200,19 +392,16 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
         # Convert to hours
         work_hours = Decimal(work_duration.total_seconds() / 3600)
 
-        # Subtract break time
-        break_duration = sum(
-            break_entry.duration_hours
-            for break_entry in self.break_entries.all()
-            if not break_entry.is_paid
-        )
+        # Subtract unpaid break time
+        break_duration = Decimal(self.unpaid_break_minutes) / 60
         self.break_hours = break_duration
 
         net_work_hours = max(Decimal('0.00'), work_hours - break_duration)
 
         # Calculate regular and overtime
-        if self.user and self.user.compliance_settings:
-            daily_limit = self.user.compliance_settings.max_hours_per_day
+        compliance_settings = self.get_compliance_settings()
+        if compliance_settings:
+            daily_limit = compliance_settings.max_hours_per_day
         else:
             daily_limit = 8
 
@@ -229,8 +418,9 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
         regular_amount = self.regular_hours * self.hourly_rate
 
         # Apply overtime multiplier
-        if self.user and self.user.compliance_settings:
-            overtime_multiplier = self.user.compliance_settings.overtime_rate_multiplier
+        compliance_settings = self.get_compliance_settings()
+        if compliance_settings:
+            overtime_multiplier = compliance_settings.overtime_rate_multiplier
         else:
             overtime_multiplier = Decimal('1.5')
 
@@ -238,6 +428,17 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
 
         self.billable_amount = regular_amount + overtime_amount
 
+    def prime_empty_breaks(self):
+        """
+        Mark a just-created entry as having no breaks.
+
+        Serializing the new entry then reads break_entries from the prefetch
+        cache instead of querying for rows that can't exist yet.
+        """
+        if not hasattr(self, '_prefetched_objects_cache'):
+            self._prefetched_objects_cache = {}
+        self._prefetched_objects_cache['break_entries'] = BreakEntry.objects.none()
+
     @property
     def is_active(self):
         """Check if time entry is currently active (clocked in but not out)."""
@@ -260,7 +461,7 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
     def can_be_edited_by(self, user):
         """Check if user can edit this time entry."""
         # Own entries can be edited if not locked or approved
-        if self.user == user and not self.is_locked and self.status not in ['approved']:
+        if self.user_id == user.pk and not self.is_locked and self.status not in ['approved']:
             return True
 
         # Managers can edit team entries
@@ -274,7 +475,7 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
         if self.status == self.DRAFT:
             self.status = self.SUBMITTED
             self.submitted_at = timezone.now()
-            self.save(update_fields=['status', 'submitted_at'])
+            self.save(update_fields=['status', 'submitted_at', 'updated_at'])
 
     def approve(self, approved_by, notes=''):
         """Approve time entry."""
@@ -283,7 +484,29 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
         self.approved_at = timezone.now()
         self.approval_notes = notes
         self.is_locked = True
-        self.save(update_fields=['status', 'approved_by', 'approved_at', 'approval_notes', 'is_locked'])
+        self.save(update_fields=[
+            'status', 'approved_by', 'approved_at', 'approval_notes', 'is_locked', 'updated_at'
+        ])
+
+    @classmethod
+    def bulk_lock(cls, queryset, approved_by=None, notes=''):
+        """
+        Approve and lock every entry in queryset with a single UPDATE.
+
+        Use this instead of calling approve() per entry when locking a whole
+        period; it bypasses save() so hours and billing are not recalculated.
+        """
+        now = timezone.now()
+        changes = {
+            'status': cls.APPROVED,
+            'approved_at': now,
+            'is_locked': True,
+            'updated_at': now,
+        }
+        if approved_by is not None:
+            changes['approved_by'] = approved_by
+            changes['approval_notes'] = notes
+        return queryset.update(**changes)
 
     def reject(self, rejected_by, notes=''):
         """Reject time entry."""
@@ -291,7 +514,9 @@ class TimeEntry(OrganizationScopedModel, ApprovalStatusMixin):
         self.approved_by = rejected_by
         self.approved_at = timezone.now()
         self.approval_notes = notes
-        self.save(update_fields=['status', 'approved_by', 'approved_at', 'approval_notes'])
+        self.save(update_fields=[
+            'status', 'approved_by', 'approved_at', 'approval_notes', 'updated_at'
+        ])
 
 
 class TimeModificationRequest(OrganizationScopedModel, ApprovalStatusMixin):
@@ -352,11 +577,28 @@ class TimeModificationRequest(OrganizationScopedModel, ApprovalStatusMixin):
         self.save()
 
         # Apply changes to time entry
-        for field, new_value in self.requested_changes.items():
-            if hasattr(self.time_entry, field):
-                setattr(self.time_entry, field, new_value)
+        changes = self.get_time_entry_changes()
+        if not changes:
+            return
 
-        self.time_entry.save()
+        # save() only recomputes hours and billing when their inputs changed,
+        # and its post_save keeps the owner's cached responses in sync
+        for field_name, value in changes.items():
+            setattr(self.time_entry, field_name, value)
+        self.time_entry.save(update_fields=[*changes, 'updated_at'])
+
+    def get_time_entry_changes(self):
+        """Get requested changes keyed by TimeEntry column, coerced to Python values."""
+        changes = {}
+        for name, value in self.requested_changes.items():
+            try:
+                field = TimeEntry._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if not field.concrete or field.primary_key:
+                continue
+            changes[field.attname] = field.to_python(value)
+        return changes
 
     def reject(self, reviewer, notes=''):
         """Reject modification request."""
@@ -396,6 +638,10 @@ class TimesheetPeriod(OrganizationScopedModel):
         related_name='processed_timesheet_periods'
     )
 
+    # Totals snapshot, stored when the period is closed or locked
+    total_hours = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    total_billable_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
     class Meta:
         verbose_name = 'Timesheet Period'
         verbose_name_plural = 'Timesheet Periods'
@@ -417,29 +663,57 @@ class TimesheetPeriod(OrganizationScopedModel):
             is_deleted=False
         )
 
+    def get_totals(self):
+        """
+        Get total hours and billable amount for this period.
+
+        Locked periods can no longer change, so their stored snapshot is
+        returned; otherwise the entries are aggregated in one query.
+        """
+        if self.is_locked and self.total_hours is not None:
+            return {
+                'total_hours': self.total_hours,
+                'total_billable_amount': self.total_billable_amount,
+            }
+        if not hasattr(self, '_totals'):
+            self._totals = self._aggregate_totals()
+        return self._totals
+
+    def _aggregate_totals(self):
+        """Aggregate total hours and billable amount from the period's entries."""
+        return self.get_time_entries().aggregate(
+            total_hours=models.Sum('total_hours'),
+            total_billable_amount=models.Sum(
+                'billable_amount',
+                filter=models.Q(is_billable=True)
+            )
+        )
+
+    def refresh_totals(self):
+        """Recalculate the stored totals snapshot (caller saves)."""
+        self._totals = self._aggregate_totals()
+        self.total_hours = self._totals['total_hours'] or Decimal('0.00')
+        self.total_billable_amount = self._totals['total_billable_amount'] or Decimal('0.00')
+
     def get_total_hours(self):
         """Get total hours for this period."""
-        return self.get_time_entries().aggregate(
-            total=models.Sum('total_hours')
-        )['total'] or Decimal('0.00')
+        return self.get_totals()['total_hours'] or Decimal('0.00')
 
     def get_total_billable_amount(self):
         """Get total billable amount for this period."""
-        return self.get_time_entries().filter(
-            is_billable=True
-        ).aggregate(
-            total=models.Sum('billable_amount')
-        )['total'] or Decimal('0.00')
+        return self.get_totals()['total_billable_amount'] or Decimal('0.00')
 
     def close_period(self):
         """Close the timesheet period."""
         self.is_open = False
-        self.save(update_fields=['is_open'])
+        self.refresh_totals()
+        self.save(update_fields=['is_open', 'total_hours', 'total_billable_amount'])
 
     def lock_period(self):
         """Lock the timesheet period (prevent further changes)."""
-        self.is_locked = True
-        self.save(update_fields=['is_locked'])
-
         # Lock all time entries in this period
-        self.get_time_entries().update(is_locked=True)
\ No newline at end of file
+        self.get_time_entries().update(is_locked=True)
+
+        self.refresh_totals()
+        self.is_locked = True
+        self.save(update_fields=['is_locked', 'total_hours', 'total_billable_amount'])
\ No newline at end of file
@@ -1,8 +1,12 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from apps.common.serializers import (
+    CachedFieldsMixin, CompiledRepresentationMixin, UpdateFieldsMixin
+)
 from .models import TimeEntry, BreakEntry, TimeModificationRequest, TimesheetPeriod
 
 
-class BreakEntrySerializer(serializers.ModelSerializer):
+class BreakEntrySerializer(CachedFieldsMixin, CompiledRepresentationMixin, serializers.ModelSerializer):
     duration_hours = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
 
@@ -15,7 +19,9 @@ class BreakEntrySerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class TimeEntrySerializer(serializers.ModelSerializer):
+class TimeEntrySerializer(
+    UpdateFieldsMixin, CompiledRepresentationMixin, serializers.ModelSerializer
+):
     break_entries = BreakEntrySerializer(many=True, read_only=True)
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
@@ -44,10 +50,21 @@ class TimeEntrySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['organization'] = self.context['request'].user.organization
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                time_entry = super().create(validated_data)
+        except IntegrityError:
+            # Only a running entry can hit the one-active-entry constraint
+            user = validated_data['user']
+            if validated_data.get('clock_out') or not TimeEntry.objects.active_for(user).exists():
+                raise
+            raise serializers.ValidationError("You already have an active time entry")
+
+        time_entry.prime_empty_breaks()
+        return time_entry
 
 
-class TimeModificationRequestSerializer(serializers.ModelSerializer):
+class TimeModificationRequestSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     requested_by_name = serializers.CharField(source='requested_by.get_full_name', read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.get_full_name', read_only=True)
 
@@ -62,7 +79,7 @@ class TimeModificationRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class TimesheetPeriodSerializer(serializers.ModelSerializer):
+class TimesheetPeriodSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     total_hours = serializers.ReadOnlyField(source='get_total_hours')
     total_billable_amount = serializers.ReadOnlyField(source='get_total_billable_amount')
 
@@ -76,7 +93,41 @@ class TimesheetPeriodSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class TimeEntryCreateSerializer(serializers.ModelSerializer):
+class ActiveTimeEntryMixin:
+    """
+    Serializer mixin that looks up the user's active time entry once.
+
+    The entry (or None) is cached on the serializer context, so validate()
+    and save() of the same request share a single query.
+    """
+    _active_entry_key = '_active_time_entry'
+
+    def get_active_entry(self):
+        """Get the requesting user's active time entry, or None."""
+        if self._active_entry_key not in self.context:
+            user = self.context['request'].user
+            self.context[self._active_entry_key] = TimeEntry.objects.active_for(user).first()
+        return self.context[self._active_entry_key]
+
+
+class ProjectAccessMixin:
+    """
+    Serializer mixin that checks project time-logging access once per project.
+
+    can_user_log_time() results are cached on the serializer context by
+    project id, so validators checking the same project share one lookup.
+    """
+    _project_access_key = '_project_log_time_access'
+
+    def can_log_time(self, project):
+        """Check if the requesting user can log time to project."""
+        access = self.context.setdefault(self._project_access_key, {})
+        if project.pk not in access:
+            access[project.pk] = project.can_user_log_time(self.context['request'].user)
+        return access[project.pk]
+
+
+class TimeEntryCreateSerializer(CachedFieldsMixin, ProjectAccessMixin, serializers.ModelSerializer):
     """
     Time entry creation serializer with validation.
     """
@@ -95,15 +146,15 @@ class TimeEntryCreateSerializer(serializers.ModelSerializer):
         task = attrs.get('task')
 
         # Validate project access
-        if project and not project.can_user_log_time(user):
+        if project and not self.can_log_time(project):
             raise serializers.ValidationError("You don't have access to this project")
 
         # Validate task belongs to project
-        if task and project and task.project != project:
+        if task and project and task.project_id != project.pk:
             raise serializers.ValidationError("Task must belong to the selected project")
 
-        # Validate task access
-        if task and not task.project.can_user_log_time(user):
+        # Validate task access (the task's project is project when one was given)
+        if task and not self.can_log_time(project or task.project):
             raise serializers.ValidationError("You don't have access to this task")
 
         # Check for overlapping time entries
@@ -112,13 +163,7 @@ class TimeEntryCreateSerializer(serializers.ModelSerializer):
         clock_out = attrs.get('clock_out')
 
         if clock_in and date:
-            overlapping_entries = TimeEntry.objects.filter(
-                user=user,
-                date=date,
-                clock_out__isnull=True,  # Active entries
-                is_deleted=False
-            )
-            if overlapping_entries.exists():
+            if TimeEntry.objects.active_for(user).filter(date=date).exists():
                 raise serializers.ValidationError("You already have an active time entry")
 
         return attrs
@@ -130,7 +175,7 @@ class TimeEntryCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TimeEntryClockInSerializer(serializers.Serializer):
+class TimeEntryClockInSerializer(ProjectAccessMixin, ActiveTimeEntryMixin, serializers.Serializer):
     """
     Time entry clock-in serializer.
     """
@@ -142,13 +187,16 @@ class TimeEntryClockInSerializer(serializers.Serializer):
         """Validate project exists and user has access."""
         from apps.projects.models import Project
         try:
-            project = Project.objects.get(
+            # Load just the columns can_user_log_time() reads
+            project = Project.objects.only(
+                'id', 'project_manager', 'allow_time_tracking', 'is_active'
+            ).get(
                 id=value,
                 organization=self.context['organization'],
                 is_active=True,
                 is_deleted=False
             )
-            if not project.can_user_log_time(self.context['request'].user):
+            if not self.can_log_time(project):
                 raise serializers.ValidationError("You don't have access to this project")
             return project
         except Project.DoesNotExist:
@@ -161,7 +209,7 @@ class TimeEntryClockInSerializer(serializers.Serializer):
 
         from apps.projects.models import Task
         try:
-            task = Task.objects.get(
+            task = Task.objects.only('id', 'project').get(
                 id=value,
                 organization=self.context['organization'],
                 is_active=True,
@@ -173,21 +221,15 @@ class TimeEntryClockInSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         """Validate clock-in data."""
-        user = self.context['request'].user
         project = attrs.get('project')
         task = attrs.get('task')
 
         # Check for active time entries
-        active_entries = TimeEntry.objects.filter(
-            user=user,
-            clock_out__isnull=True,
-            is_deleted=False
-        )
-        if active_entries.exists():
+        if self.get_active_entry() is not None:
             raise serializers.ValidationError("You already have an active time entry")
 
         # Validate task belongs to project
-        if task and task.project != project:
+        if task and task.project_id != project.pk:
             raise serializers.ValidationError("Task must belong to the selected project")
 
         return attrs
@@ -199,16 +241,22 @@ class TimeEntryClockInSerializer(serializers.Serializer):
         user = self.context['request'].user
         organization = self.context['organization']
 
-        time_entry = TimeEntry.objects.create(
-            user=user,
-            organization=organization,
-            project=self.validated_data['project'],
-            task=self.validated_data.get('task'),
-            date=timezone.now().date(),
-            clock_in=timezone.now(),
-            description=self.validated_data.get('description', ''),
-            hourly_rate=user.hourly_rate
-        )
+        try:
+            with transaction.atomic():
+                time_entry = TimeEntry.objects.create(
+                    user=user,
+                    organization=organization,
+                    project=self.validated_data['project'],
+                    task=self.validated_data.get('task'),
+                    date=timezone.now().date(),
+                    clock_in=timezone.now(),
+                    description=self.validated_data.get('description', ''),
+                    hourly_rate=user.hourly_rate
+                )
+        except IntegrityError:
+            if not TimeEntry.objects.active_for(user).exists():
+                raise
+            raise serializers.ValidationError("You already have an active time entry")
         return time_entry
 
 
@@ -225,21 +273,23 @@ class TimeEntryClockOutSerializer(serializers.Serializer):
         user = self.context['request'].user
 
         try:
-            time_entry = TimeEntry.objects.get(
-                user=user,
-                clock_out__isnull=True,
-                is_deleted=False
-            )
-            time_entry.clock_out = timezone.now()
-            if self.validated_data.get('description'):
-                time_entry.description = self.validated_data['description']
-            time_entry.save()
+            with transaction.atomic():
+                # Lock the entry so a break ending concurrently can't change the
+                # unpaid break minutes the hours are computed from
+                time_entry = TimeEntry.objects.active_for(user).select_related(
+                    'user__compliance_settings'
+                ).select_for_update(of=('self',)).get()
+                time_entry.clock_out = timezone.now()
+                if self.validated_data.get('description'):
+                    time_entry.description = self.validated_data['description']
+                # The break counter is only written through F() deltas
+                time_entry.save(update_fields=['clock_out', 'description', 'updated_at'])
             return time_entry
         except TimeEntry.DoesNotExist:
             raise serializers.ValidationError("No active time entry found")
 
 
-class TimeEntryUpdateSerializer(serializers.ModelSerializer):
+class TimeEntryUpdateSerializer(CachedFieldsMixin, ProjectAccessMixin, serializers.ModelSerializer):
     """
     Time entry update serializer.
     """
@@ -260,19 +310,19 @@ class TimeEntryUpdateSerializer(serializers.ModelSerializer):
 
         # Validate project access if changing project
         project = attrs.get('project')
-        if project and project != self.instance.project:
-            if not project.can_user_log_time(user):
+        if project and project.pk != self.instance.project_id:
+            if not self.can_log_time(project):
                 raise serializers.ValidationError("You don't have access to the new project")
 
         # Validate task belongs to project
         task = attrs.get('task')
-        if task and project and task.project != project:
+        if task and project and task.project_id != project.pk:
             raise serializers.ValidationError("Task must belong to the selected project")
 
         return attrs
 
 
-class BreakEntryCreateSerializer(serializers.ModelSerializer):
+class BreakEntryCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Break entry creation serializer.
     """
@@ -293,7 +343,7 @@ class BreakEntryCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TimeEntryStartBreakSerializer(serializers.Serializer):
+class TimeEntryStartBreakSerializer(ActiveTimeEntryMixin, serializers.Serializer):
     """
     Start break serializer.
     """
@@ -305,17 +355,11 @@ class TimeEntryStartBreakSerializer(serializers.Serializer):
         """Start a break for the active time entry."""
         from django.utils import timezone
 
-        user = self.context['request'].user
         organization = self.context['organization']
 
         # Find active time entry
-        try:
-            time_entry = TimeEntry.objects.get(
-                user=user,
-                clock_out__isnull=True,
-                is_deleted=False
-            )
-        except TimeEntry.DoesNotExist:
+        time_entry = self.get_active_entry()
+        if time_entry is None:
             raise serializers.ValidationError("No active time entry found")
 
         # Check if already on break
@@ -339,29 +383,23 @@ class TimeEntryStartBreakSerializer(serializers.Serializer):
         return break_entry
 
 
-class TimeEntryEndBreakSerializer(serializers.Serializer):
+class TimeEntryEndBreakSerializer(ActiveTimeEntryMixin, serializers.Serializer):
     """
     End break serializer.
     """
     def save(self):
         """End the active break."""
-        from django.utils import timezone
-
-        user = self.context['request'].user
-
         # Find active break
-        try:
-            time_entry = TimeEntry.objects.get(
-                user=user,
-                clock_out__isnull=True,
-                is_deleted=False
-            )
-            break_entry = BreakEntry.objects.get(
+        time_entry = self.get_active_entry()
+        break_entry = None
+        if time_entry is not None:
+            break_entry = BreakEntry.objects.filter(
                 time_entry=time_entry,
                 end_time__isnull=True
-            )
-            break_entry.end_time = timezone.now()
-            break_entry.save()
-            return break_entry
-        except (TimeEntry.DoesNotExist, BreakEntry.DoesNotExist):
-            raise serializers.ValidationError("No active break found")
\ No newline at end of file
+            ).first()
+
+        if break_entry is None:
+            raise serializers.ValidationError("No active break found")
+
+        break_entry.end()
+        return break_entry
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Time tracking signal handlers.
+
+Keeps the cached per-user responses in sync with time and break entry
+writes, and queues the owner's overtime check when a closed entry's hours
+change; both wait for the commit so they never see the old row.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from kombu.exceptions import OperationalError
+
+from .cache import invalidate_user_caches
+from .models import BreakEntry, TimeEntry
+
+logger = logging.getLogger(__name__)
+
+
+def queue_overtime_check(user_id):
+    """
+    Queue a user's overtime check without letting the broker fail the request.
+
+    The write has already committed, so a slow or unreachable broker is
+    logged and skipped rather than retried; the hourly sweep picks the
+    user up instead. Nothing reads the result, so the result backend
+    doesn't subscribe to it (with its own retries) either.
+    """
+    # Import here to avoid circular imports
+    from apps.compliance.tasks import check_overtime_violations
+
+    try:
+        # A one-off connection that fails fast instead of the pooled one,
+        # which keeps retrying to connect for the other publishers' sake
+        with check_overtime_violations.app.connection_for_write(
+            transport_options={'max_retries': 0}
+        ) as connection:
+            check_overtime_violations.apply_async(
+                args=[user_id], connection=connection, retry=False, ignore_result=True
+            )
+    except OperationalError:
+        logger.warning(
+            'Could not queue the overtime check for user %s', user_id, exc_info=True
+        )
+
+
+@receiver([post_save, post_delete], sender=TimeEntry)
+def time_entry_changed(sender, instance, **kwargs):
+    """Invalidate the owner's cached responses once the write commits."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_caches(user_id))
+
+
+@receiver(post_save, sender=TimeEntry)
+def time_entry_hours_written(sender, instance, update_fields=None, **kwargs):
+    """Queue the owner's overtime check once a closed entry's hours commit."""
+    if instance.clock_out is None:
+        return
+    if update_fields is not None and not TimeEntry.HOURS_FIELDS & set(update_fields):
+        return
+
+    user_id = instance.user_id
+    transaction.on_commit(lambda: queue_overtime_check(user_id))
+
+
+@receiver([post_save, post_delete], sender=BreakEntry)
+def break_entry_changed(sender, instance, **kwargs):
+    """Invalidate the owner's cached responses once the break write commits."""
+    user_id = instance.time_entry.user_id
+    transaction.on_commit(lambda: invalidate_user_caches(user_id))
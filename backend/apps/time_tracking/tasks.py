@@ -7,14 +7,25 @@ This module provides background tasks for:
 - Time tracking analytics
 """
 
-from celery import shared_task
+from celery import group, shared_task
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Count, Exists, Max, OuterRef, Q, Sum
 import logging
-from datetime import timedelta, datetime
+from datetime import date, time, timedelta, datetime
 
 logger = logging.getLogger(__name__)
 
+# Rows streamed and written back per round trip when auto-stopping entries
+AUTO_STOP_BATCH_SIZE = 500
+
+
+def _duration_hours(duration):
+    """Convert an aggregated duration (None when nothing matched) to hours."""
+    if duration is None:
+        return 0
+    return duration.total_seconds() / 3600
+
 
 @shared_task
 def process_timesheet_periods():
@@ -26,93 +37,67 @@ def process_timesheet_periods():
     - Generate time summaries
     - Calculate billable hours
     - Update project progress
+
+    Closing periods is fanned out as one process_organization_timesheet_periods
+    task per organization so it runs in parallel across workers.
     """
     try:
         logger.info("Starting timesheet period processing...")
 
         # Import here to avoid circular imports
-        from apps.time_tracking.models import TimeEntry, TimesheetPeriod
-        from apps.projects.models import Project
+        from apps.time_tracking.models import TimesheetPeriod
         from apps.organizations.models import Organization
 
-        processed_periods = 0
-        current_time = timezone.now()
+        today = timezone.now().date()
 
-        # Find timesheet periods that need processing
-        periods_to_process = TimesheetPeriod.objects.filter(
-            status='open',
-            end_date__lt=current_time.date(),
-            is_active=True
+        # Find organizations with finished periods that are still open
+        organization_ids = set(
+            TimesheetPeriod.objects.filter(
+                is_open=True,
+                end_date__lt=today
+            ).order_by().values_list('organization_id', flat=True).distinct()
         )
 
-        for period in periods_to_process:
-            try:
-                with transaction.atomic():
-                    # Get all time entries for this period
-                    entries = TimeEntry.objects.filter(
-                        organization=period.organization,
-                        clock_in__date__gte=period.start_date,
-                        clock_in__date__lte=period.end_date,
-                        clock_out__isnull=False
-                    )
-
-                    # Calculate totals
-                    total_hours = sum([
-                        (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                        for entry in entries
-                    ])
-
-                    billable_hours = sum([
-                        (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                        for entry in entries
-                        if entry.is_billable
-                    ])
-
-                    # Update period with calculations
-                    period.total_hours = round(total_hours, 2)
-                    period.billable_hours = round(billable_hours, 2)
-                    period.status = 'closed'
-                    period.processed_at = current_time
-                    period.save()
-
-                    logger.info(f"Processed period {period.id} for {period.organization.name}: "
-                              f"{period.total_hours}h total, {period.billable_hours}h billable")
-
-                    processed_periods += 1
-
-            except Exception as period_error:
-                logger.error(f"Error processing period {period.id}: {str(period_error)}")
-                continue
+        # Look up every organization's latest period end in one grouped query
+        latest_end_dates = dict(
+            TimesheetPeriod.objects.values('organization_id').annotate(
+                max_end=Max('end_date')
+            ).order_by().values_list('organization_id', 'max_end')
+        )
 
         # Create new periods for organizations that need them
-        organizations = Organization.objects.filter(is_active=True)
-        new_periods_created = 0
+        organizations = Organization.objects.filter(is_active=True).only('id', 'name')
+        new_periods = []
 
         for org in organizations:
-            # Check if organization needs a new current period
-            latest_period = TimesheetPeriod.objects.filter(
-                organization=org
-            ).order_by('-end_date').first()
+            latest_end = latest_end_dates.get(org.id)
 
-            if not latest_period or latest_period.end_date < current_time.date():
+            if latest_end is None or latest_end < today:
                 # Create new period (weekly periods)
-                start_date = current_time.date()
-                if latest_period:
-                    start_date = latest_period.end_date + timedelta(days=1)
+                start_date = today
+                if latest_end is not None:
+                    start_date = latest_end + timedelta(days=1)
 
                 end_date = start_date + timedelta(days=6)  # Weekly period
 
-                new_period = TimesheetPeriod.objects.create(
+                new_periods.append(TimesheetPeriod(
                     organization=org,
+                    name=f"Week of {start_date}",
                     start_date=start_date,
-                    end_date=end_date,
-                    status='open'
-                )
+                    end_date=end_date
+                ))
+
+                logger.info(f"Creating new period for {org.name}: {start_date} to {end_date}")
 
-                logger.info(f"Created new period for {org.name}: {start_date} to {end_date}")
-                new_periods_created += 1
+        TimesheetPeriod.objects.bulk_create(new_periods, batch_size=500)
 
-        result = f"Processed {processed_periods} timesheet periods, created {new_periods_created} new periods"
+        group(
+            process_organization_timesheet_periods.s(str(organization_id), today.isoformat())
+            for organization_id in organization_ids
+        ).apply_async()
+
+        result = (f"Dispatched timesheet period processing for {len(organization_ids)} organizations, "
+                  f"created {len(new_periods)} new periods")
         logger.info(result)
         return result
 
@@ -121,6 +106,63 @@ def process_timesheet_periods():
         raise
 
 
+@shared_task
+def process_organization_timesheet_periods(organization_id, today):
+    """
+    Close one organization's finished timesheet periods.
+
+    Args:
+        organization_id: Primary key of the organization, as a string
+        today: The scheduler's current date in ISO format
+    """
+    try:
+        # Import here to avoid circular imports
+        from apps.time_tracking.models import TimesheetPeriod
+        from apps.organizations.models import Organization
+
+        organization = Organization.objects.get(pk=organization_id)
+        today = date.fromisoformat(today)
+
+        # Find timesheet periods that need processing
+        periods_to_process = TimesheetPeriod.objects.filter(
+            organization=organization,
+            is_open=True,
+            end_date__lt=today
+        )
+
+        closed_periods = []
+
+        for period in periods_to_process:
+            try:
+                # Snapshot the period totals with one aggregate
+                period.refresh_totals()
+                period.is_open = False
+                closed_periods.append(period)
+
+                logger.info(f"Processed period {period.id} for {organization.name}: "
+                          f"{period.total_hours}h total, {period.total_billable_amount} billable")
+
+            except Exception as period_error:
+                logger.error(f"Error processing period {period.id}: {str(period_error)}")
+                continue
+
+        # Close every processed period in one batched UPDATE
+        with transaction.atomic():
+            TimesheetPeriod.objects.bulk_update(
+                closed_periods,
+                ['is_open', 'total_hours', 'total_billable_amount'],
+                batch_size=500
+            )
+
+        result = f"Processed {len(closed_periods)} timesheet periods for {organization.name}"
+        logger.info(result)
+        return result
+
+    except Exception as e:
+        logger.error(f"Error processing timesheet periods for organization {organization_id}: {str(e)}")
+        raise
+
+
 @shared_task
 def auto_stop_long_running_entries():
     """
@@ -133,6 +175,7 @@ def auto_stop_long_running_entries():
         logger.info("Starting auto-stop for long running entries...")
 
         # Import here to avoid circular imports
+        from apps.time_tracking.cache import invalidate_user_caches
         from apps.time_tracking.models import TimeEntry
 
         # Get current time
@@ -145,25 +188,41 @@ def auto_stop_long_running_entries():
             clock_in__lt=cutoff_time,
             clock_out__isnull=True,  # Still active
             user__is_active=True
-        ).select_related('user', 'task', 'project')
+        ).select_related('user__compliance_settings')
 
+        update_fields = [
+            'clock_out', 'break_hours', 'regular_hours', 'overtime_hours',
+            'total_hours', 'billable_amount', 'updated_at',
+        ]
+        stopped = []
         stopped_count = 0
 
-        for entry in long_entries:
+        for entry in long_entries.iterator(chunk_size=AUTO_STOP_BATCH_SIZE):
             try:
                 # Stop the entry at the cutoff time to avoid excessive hours
                 entry.clock_out = entry.clock_in + timedelta(hours=24)
-                entry.save()
+                entry.calculate_hours()
+                entry.calculate_billing()
+                entry.updated_at = now
+                stopped.append(entry)
+                stopped_count += 1
 
                 logger.warning(f"Auto-stopped long running entry for {entry.user.email}: "
                              f"Entry ID {entry.id}, was running for {(now - entry.clock_in).total_seconds() / 3600:.1f} hours")
 
-                stopped_count += 1
-
             except Exception as entry_error:
                 logger.error(f"Error stopping entry {entry.id}: {str(entry_error)}")
                 continue
 
+            # Flush each chunk so only one batch of entries is held in memory
+            if len(stopped) >= AUTO_STOP_BATCH_SIZE:
+                TimeEntry.objects.bulk_update(stopped, update_fields)
+                invalidate_user_caches(*{entry.user_id for entry in stopped})
+                stopped = []
+
+        TimeEntry.objects.bulk_update(stopped, update_fields)
+        invalidate_user_caches(*{entry.user_id for entry in stopped})
+
         result = f"Auto-stopped {stopped_count} long running time entries"
         logger.info(result)
         return result
@@ -188,55 +247,61 @@ def calculate_project_progress():
         from apps.projects.models import Project
         from apps.time_tracking.models import TimeEntry
 
-        updated_projects = 0
-
         # Get active projects with budget hours defined
-        projects = Project.objects.filter(
+        projects = list(Project.objects.filter(
             is_active=True,
             budget_hours__isnull=False,
             budget_hours__gt=0
+        ).only('id', 'name', 'budget_hours', 'start_date', 'progress_percentage'))
+        today = timezone.now().date()
+
+        # Total the hours spent on every project in one grouped query
+        hours_by_project = dict(
+            TimeEntry.objects.filter(
+                project__in=projects,
+                clock_out__isnull=False
+            ).with_worked_duration().values('project_id').annotate(
+                total=Sum('worked_duration')
+            ).order_by().values_list('project_id', 'total')
         )
 
+        updated = []
+
         for project in projects:
             try:
-                # Calculate total hours spent on this project
-                entries = TimeEntry.objects.filter(
-                    project=project,
-                    clock_out__isnull=False
-                )
-
-                total_hours = sum([
-                    (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                    for entry in entries
-                ])
+                total_hours = _duration_hours(hours_by_project.get(project.id))
 
                 # Calculate progress percentage
                 progress_percentage = min(100, (total_hours / project.budget_hours) * 100)
 
                 # Estimate completion date if there's a consistent work rate
                 if total_hours > 0 and project.start_date:
-                    days_elapsed = (timezone.now().date() - project.start_date).days
+                    days_elapsed = (today - project.start_date).days
                     if days_elapsed > 0:
                         hours_per_day = total_hours / days_elapsed
                         remaining_hours = project.budget_hours - total_hours
 
                         if remaining_hours > 0 and hours_per_day > 0:
                             estimated_days_remaining = remaining_hours / hours_per_day
-                            estimated_completion = timezone.now().date() + timedelta(days=estimated_days_remaining)
+                            estimated_completion = today + timedelta(days=estimated_days_remaining)
 
                             # You can add an estimated_completion_date field to Project model
                             logger.info(f"Project {project.name}: {progress_percentage:.1f}% complete, "
                                       f"estimated completion: {estimated_completion}")
 
+                project.progress_percentage = int(progress_percentage)
+                updated.append(project)
+
                 logger.info(f"Updated progress for project {project.name}: "
                           f"{total_hours:.1f}/{project.budget_hours}h ({progress_percentage:.1f}%)")
 
-                updated_projects += 1
-
             except Exception as project_error:
                 logger.error(f"Error calculating progress for project {project.id}: {str(project_error)}")
                 continue
 
+        Project.objects.bulk_update(updated, ['progress_percentage'], batch_size=500)
+        updated_projects = len(updated)
+
         result = f"Updated progress for {updated_projects} projects"
         logger.info(result)
         return result
@@ -260,52 +325,50 @@ def generate_daily_time_summaries():
         # Import here to avoid circular imports
         from apps.time_tracking.models import TimeEntry
         from apps.users.models import User
-        from apps.organizations.models import Organization
+        from apps.organizations.models import OrganizationMember
 
-        # Get yesterday's date
+        # Get yesterday's date and its bounds in the current time zone
         yesterday = timezone.now().date() - timedelta(days=1)
+        day_start = timezone.make_aware(datetime.combine(yesterday, time.min))
+        day_end = timezone.make_aware(datetime.combine(yesterday + timedelta(days=1), time.min))
+
+        # Total every member's yesterday in one grouped query
+        is_member = OrganizationMember.objects.filter(
+            organization=OuterRef('organization'),
+            user=OuterRef('user')
+        )
+        summaries = TimeEntry.objects.filter(
+            Exists(is_member),
+            organization__is_active=True,
+            user__is_active=True,
+            clock_in__gte=day_start,
+            clock_in__lt=day_end,
+            clock_out__isnull=False
+        ).with_worked_duration().values('organization_id', 'user_id').annotate(
+            total=Sum('worked_duration'),
+            billable=Sum('worked_duration', filter=Q(is_billable=True)),
+            projects_count=Count('project', distinct=True)
+        ).order_by()
+
+        summaries = list(summaries)
+        emails = dict(
+            User.objects.filter(
+                pk__in={summary['user_id'] for summary in summaries}
+            ).values_list('pk', 'email')
+        )
 
         summaries_created = 0
 
-        # Generate summaries for each active organization
-        for org in Organization.objects.filter(is_active=True):
-            # Get all users in this organization
-            org_users = User.objects.filter(
-                organization_memberships__organization=org,
-                is_active=True
-            )
+        for summary in summaries:
+            total_hours = _duration_hours(summary['total'])
+            billable_hours = _duration_hours(summary['billable'])
 
-            for user in org_users:
-                # Get time entries for yesterday
-                entries = TimeEntry.objects.filter(
-                    user=user,
-                    organization=org,
-                    clock_in__date=yesterday,
-                    clock_out__isnull=False
-                )
-
-                if entries.exists():
-                    # Calculate daily totals
-                    total_hours = sum([
-                        (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                        for entry in entries
-                    ])
-
-                    billable_hours = sum([
-                        (entry.clock_out - entry.clock_in).total_seconds() / 3600
-                        for entry in entries
-                        if entry.is_billable
-                    ])
-
-                    # Count unique projects worked on
-                    projects_count = entries.values('project').distinct().count()
-
-                    # You can create a DailySummary model to store these
-                    logger.info(f"Daily summary for {user.email} on {yesterday}: "
-                              f"{total_hours:.1f}h total, {billable_hours:.1f}h billable, "
-                              f"{projects_count} projects")
-
-                    summaries_created += 1
+            # You can create a DailySummary model to store these
+            logger.info(f"Daily summary for {emails[summary['user_id']]} on {yesterday}: "
+                      f"{total_hours:.1f}h total, {billable_hours:.1f}h billable, "
+                      f"{summary['projects_count']} projects")
+
+            summaries_created += 1
 
         result = f"Generated {summaries_created} daily time summaries for {yesterday}"
         logger.info(result)
@@ -1,23 +1,38 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from datetime import timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from .models import TimeEntry, BreakEntry, TimeModificationRequest
-from .serializers import (
-    TimeEntrySerializer, BreakEntrySerializer,
-    TimeModificationRequestSerializer
-)
+from apps.common.views import SerializerPrefetchMixin
+from .cache import ACTIVE_ENTRY_TIMEOUT, TIME_SUMMARY_TIMEOUT, active_entry_key, time_summary_key
+from .models import TimeEntry, BreakEntry
+from .serializers import TimeEntrySerializer, BreakEntrySerializer
 
 
-class TimeEntryListCreateView(generics.ListCreateAPIView):
-    serializer_class = TimeEntrySerializer
-    permission_classes = [permissions.IsAuthenticated]
+class TimeEntryQuerySetMixin(SerializerPrefetchMixin):
+    """
+    Time entry queryset shared by the time entry views.
+
+    Scopes entries to the user's organization (and to the user unless they
+    manage others), joins the related rows the serializer reads and
+    prefetches the break entries in one extra query.
+    """
+    break_entry_fields = [
+        'id', 'time_entry_id', 'break_type', 'start_time', 'end_time',
+        'duration_minutes', 'is_paid', 'notes',
+    ]
 
     def get_queryset(self):
         user = self.request.user
         queryset = TimeEntry.objects.filter(
-            organization=user.organization,
+            organization_id=user.organization_id,
             is_deleted=False
         )
 
@@ -25,6 +40,37 @@ class TimeEntryListCreateView(generics.ListCreateAPIView):
         if not user.has_any_role(['manager', 'admin', 'global_admin']):
             queryset = queryset.filter(user=user)
 
+        return self.prefetch_serializer_relations(queryset)
+
+    def get_prefetch_queryset(self, path):
+        """Load only the break entry columns BreakEntrySerializer reads."""
+        if path == 'break_entries':
+            return BreakEntry.objects.only(*self.break_entry_fields)
+        return super().get_prefetch_queryset(path)
+
+
+class TimeEntryListCreateView(TimeEntryQuerySetMixin, generics.ListCreateAPIView):
+    serializer_class = TimeEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ordering_fields = ['date', 'clock_in', 'total_hours', 'status', 'created_at']
+    ordering = ['-date', '-clock_in']
+    list_only_fields = [
+        'id', 'user', 'user__first_name', 'user__last_name', 'project',
+        'project__name', 'task', 'task__title', 'department', 'department__name',
+        'date', 'clock_in', 'clock_out', 'is_manual_entry', 'manual_start_time',
+        'manual_end_time', 'regular_hours', 'overtime_hours', 'total_hours',
+        'break_hours', 'is_billable', 'hourly_rate', 'billable_amount',
+        'description', 'internal_notes', 'status', 'submitted_at', 'approved_by',
+        'approved_at', 'approval_notes', 'created_at', 'updated_at',
+    ]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Load only the columns TimeEntrySerializer reads for lists
+        if self.request.method == 'GET':
+            queryset = queryset.only(*self.list_only_fields)
+
         # Apply filters
         date_from = self.request.query_params.get('date_from')
         date_to = self.request.query_params.get('date_to')
@@ -33,7 +79,7 @@ class TimeEntryListCreateView(generics.ListCreateAPIView):
         if date_to:
             queryset = queryset.filter(date__lte=date_to)
 
-        return queryset.order_by('-date', '-clock_in')
+        return queryset.order_by(*self.ordering)
 
     def perform_create(self, serializer):
         serializer.save(
@@ -42,22 +88,27 @@ class TimeEntryListCreateView(generics.ListCreateAPIView):
         )
 
 
-class TimeEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TimeEntryDetailView(TimeEntryQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TimeEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        user = self.request.user
-        queryset = TimeEntry.objects.filter(
-            organization=user.organization,
-            is_deleted=False
-        )
-
-        # Filter by user if not manager/admin
-        if not user.has_any_role(['manager', 'admin', 'global_admin']):
-            queryset = queryset.filter(user=user)
-
-        return queryset
+    def perform_update(self, serializer):
+        """Recompute the entry's hours from its locked, current break minutes."""
+        instance = serializer.instance
+        with transaction.atomic():
+            instance.unpaid_break_minutes = TimeEntry.objects.select_for_update().values_list(
+                'unpaid_break_minutes', flat=True
+            ).get(pk=instance.pk)
+
+            # Reopening the entry can hit the one-active-entry-per-user constraint
+            try:
+                with transaction.atomic():
+                    serializer.save()
+            except IntegrityError:
+                other_active = TimeEntry.objects.active_for(instance.user).exclude(pk=instance.pk)
+                if instance.clock_out is not None or not other_active.exists():
+                    raise
+                raise ValidationError("You are already clocked in")
 
 
 @api_view(['POST'])
@@ -67,34 +118,32 @@ def clock_in(request):
     user = request.user
     now = timezone.now()
 
-    # Check if user already has an active time entry
-    active_entry = TimeEntry.objects.filter(
-        user=user,
-        clock_out__isnull=True,
-        is_deleted=False
-    ).first()
+    # Create new time entry
+    project_id = request.data.get('project_id')
+    description = request.data.get('description', '')
 
-    if active_entry:
+    # The one-active-entry-per-user constraint rejects a second clock-in
+    try:
+        with transaction.atomic():
+            time_entry = TimeEntry.objects.create(
+                user=user,
+                organization_id=user.organization_id,
+                project_id=project_id if project_id else None,
+                department_id=user.department_id,
+                date=now.date(),
+                clock_in=now,
+                description=description,
+                status='draft'
+            )
+    except IntegrityError:
+        if not TimeEntry.objects.active_for(user).exists():
+            raise
         return Response(
             {'error': 'You are already clocked in'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Create new time entry
-    project_id = request.data.get('project_id')
-    description = request.data.get('description', '')
-
-    time_entry = TimeEntry.objects.create(
-        user=user,
-        organization=user.organization,
-        project_id=project_id if project_id else None,
-        department=user.department,
-        date=now.date(),
-        clock_in=now,
-        description=description,
-        status='draft'
-    )
-
+    time_entry.prime_empty_breaks()
     serializer = TimeEntrySerializer(time_entry)
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -106,23 +155,23 @@ def clock_out(request):
     user = request.user
     now = timezone.now()
 
-    # Find active time entry
-    active_entry = TimeEntry.objects.filter(
-        user=user,
-        clock_out__isnull=True,
-        is_deleted=False
-    ).first()
+    with transaction.atomic():
+        # Lock the entry so a break ending concurrently can't change the
+        # unpaid break minutes the hours are computed from
+        active_entry = TimeEntry.objects.active_for(user).select_related(
+            'user__compliance_settings'
+        ).select_for_update(of=('self',)).first()
 
-    if not active_entry:
-        return Response(
-            {'error': 'No active time entry found'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        if not active_entry:
+            return Response(
+                {'error': 'No active time entry found'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-    # End the time entry
-    active_entry.clock_out = now
-    active_entry.status = 'submitted'
-    active_entry.save()
+        # End the time entry; the break counter is only written through F() deltas
+        active_entry.clock_out = now
+        active_entry.status = 'submitted'
+        active_entry.save(update_fields=['clock_out', 'status', 'updated_at'])
 
     serializer = TimeEntrySerializer(active_entry)
     return Response(serializer.data)
@@ -133,8 +182,14 @@ def clock_out(request):
 def start_break(request, time_entry_id):
     """Start a break for a time entry."""
     user = request.user
+
+    # Load the entry and whether it already has an active break in one query
     time_entry = get_object_or_404(
-        TimeEntry,
+        TimeEntry.objects.annotate(
+            has_active_break=Exists(
+                BreakEntry.objects.filter(time_entry=OuterRef('pk'), end_time__isnull=True)
+            )
+        ),
         id=time_entry_id,
         user=user,
         is_deleted=False
@@ -147,8 +202,7 @@ def start_break(request, time_entry_id):
         )
 
     # Check if there's already an active break
-    active_break = time_entry.break_entries.filter(end_time__isnull=True).first()
-    if active_break:
+    if time_entry.has_active_break:
         return Response(
             {'error': 'Break is already active'},
             status=status.HTTP_400_BAD_REQUEST
@@ -174,23 +228,22 @@ def start_break(request, time_entry_id):
 def end_break(request, time_entry_id):
     """End the current break for a time entry."""
     user = request.user
-    time_entry = get_object_or_404(
-        TimeEntry,
-        id=time_entry_id,
-        user=user,
-        is_deleted=False
-    )
 
-    # Find active break
-    active_break = time_entry.break_entries.filter(end_time__isnull=True).first()
+    # Find the active break together with its time entry
+    active_break = BreakEntry.objects.select_related('time_entry').filter(
+        time_entry_id=time_entry_id,
+        time_entry__user=user,
+        time_entry__is_deleted=False,
+        end_time__isnull=True
+    ).first()
     if not active_break:
+        get_object_or_404(TimeEntry, id=time_entry_id, user=user, is_deleted=False)
         return Response(
             {'error': 'No active break found'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    active_break.end_time = timezone.now()
-    active_break.save()
+    active_break.end()
 
     serializer = BreakEntrySerializer(active_break)
     return Response(serializer.data)
@@ -201,17 +254,24 @@ def end_break(request, time_entry_id):
 def current_time_entry(request):
     """Get the current active time entry for the user."""
     user = request.user
-    active_entry = TimeEntry.objects.filter(
-        user=user,
-        clock_out__isnull=True,
-        is_deleted=False
-    ).first()
+    key = active_entry_key(user.pk)
+    cached = cache.get(key)
+
+    if cached is None:
+        active_entry = TimeEntry.objects.active_for(user).first()
+        cached = {
+            'clock_in': active_entry.clock_in if active_entry else None,
+            'active_entry': dict(TimeEntrySerializer(active_entry).data) if active_entry else None,
+        }
+        cache.set(key, cached, ACTIVE_ENTRY_TIMEOUT)
 
-    if not active_entry:
+    if cached['active_entry'] is None:
         return Response({'active_entry': None})
 
-    serializer = TimeEntrySerializer(active_entry)
-    return Response({'active_entry': serializer.data})
+    # The running duration moves on between polls
+    data = dict(cached['active_entry'])
+    data['duration'] = timezone.now() - cached['clock_in']
+    return Response({'active_entry': data})
 
 
 @api_view(['GET'])
@@ -221,28 +281,39 @@ def time_summary(request):
     user = request.user
     today = timezone.now().date()
 
-    # Today's summary
-    today_entries = TimeEntry.objects.filter(
+    # Totals only move on entry and break writes, which drop this key
+    key = time_summary_key(user.pk, today)
+    cached = cache.get(key)
+    if cached is not None:
+        return Response(cached)
+
+    # Today's and this week's summaries, totalled in one aggregate query
+    week_start = today - timedelta(days=today.weekday())
+    is_today = Q(date=today)
+    zero = Decimal('0.00')
+    summary = TimeEntry.objects.filter(
         user=user,
-        date=today,
+        date__gte=week_start,
+        date__lte=today,
         is_deleted=False
+    ).aggregate(
+        today_total=Coalesce(Sum('total_hours', filter=is_today), zero),
+        today_overtime=Coalesce(Sum('overtime_hours', filter=is_today), zero),
+        week_total=Coalesce(Sum('total_hours'), zero),
+        week_overtime=Coalesce(Sum('overtime_hours'), zero),
+        active=Count('id', filter=is_today & Q(clock_out__isnull=True))
     )
 
-    today_total = sum(entry.total_hours for entry in today_entries)
-    today_overtime = sum(entry.overtime_hours for entry in today_entries)
-
-    # Week summary (simplified)
-    week_total = today_total * 5  # Placeholder
-    week_overtime = today_overtime * 5  # Placeholder
-
-    return Response({
+    payload = {
         'today': {
-            'total_hours': today_total,
-            'overtime_hours': today_overtime,
-            'status': 'active' if today_entries.filter(clock_out__isnull=True).exists() else 'inactive'
+            'total_hours': summary['today_total'],
+            'overtime_hours': summary['today_overtime'],
+            'status': 'active' if summary['active'] else 'inactive'
         },
         'week': {
-            'total_hours': week_total,
-            'overtime_hours': week_overtime
+            'total_hours': summary['week_total'],
+            'overtime_hours': summary['week_overtime']
         }
-    })
\ No newline at end of file
+    }
+    cache.set(key, payload, TIME_SUMMARY_TIMEOUT)
+    return Response(payload)
\ No newline at end of file
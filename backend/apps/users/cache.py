@@ -0,0 +1,35 @@
+"""
+Cache helpers for the user read endpoints.
+
+This module provides:
+- Cache keys for per-user responses
+- ETags for conditional requests on cached responses
+- Invalidation used by signals
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.utils.http import quote_etag
+from rest_framework.utils.encoders import JSONEncoder
+
+# Upper bound on staleness for writes that bypass invalidation (e.g. role renames)
+CURRENT_USER_TIMEOUT = 300
+
+
+def current_user_key(user_id):
+    """Get the cache key of a user's current user response."""
+    # Entries hold (data, etag) pairs
+    return f'current_user_response:{user_id}'
+
+
+def response_etag(data):
+    """Get a strong ETag of serialized response data."""
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return quote_etag(hashlib.md5(payload, usedforsecurity=False).hexdigest())
+
+
+def invalidate_current_user(*user_ids):
+    """Drop the cached current user response of the given users."""
+    cache.delete_many([current_user_key(user_id) for user_id in user_ids])
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.15 on 2026-10-14 18:10
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_role_name_cache(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Role = apps.get_model("users", "Role")
+    role_name = Role.objects.filter(pk=models.OuterRef("role_id")).values("name")
+    User.objects.update(
+        role_name_cache=Coalesce(models.Subquery(role_name), models.Value(""))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="role_name_cache",
+            field=models.CharField(
+                blank=True, db_index=True, editable=False, max_length=50
+            ),
+        ),
+        migrations.RunPython(backfill_role_name_cache, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.15 on 2026-10-14 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_role_name_cache"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["first_name", "last_name", "id"], name="user_name_order"
+            ),
+        ),
+    ]
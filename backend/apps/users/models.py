@@ -10,7 +10,10 @@ This module provides user-related models that follow:
 """
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connection, models, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
 from django.core.validators import RegexValidator
 from apps.common.models import BaseModel, TimestampedModel
 
@@ -54,6 +57,11 @@ class Role(BaseModel):
     def __str__(self):
         return self.get_name_display()
 
+    def save(self, *args, **kwargs):
+        """Save the role and keep its users' cached role name in sync."""
+        super().save(*args, **kwargs)
+        self.users.exclude(role_name_cache=self.name).update(role_name_cache=self.name)
+
 
 class UserProfile(BaseModel):
     """
@@ -174,6 +182,8 @@ class User(AbstractUser):
         blank=True,
         related_name='users'
     )
+    # Denormalized role name so role checks don't need the Role row
+    role_name_cache = models.CharField(max_length=50, blank=True, db_index=True, editable=False)
 
     # Employment information
     employee_id = models.CharField(
@@ -235,27 +245,59 @@ class User(AbstractUser):
             models.Index(fields=['organization', 'is_active']),
             models.Index(fields=['department']),
             models.Index(fields=['manager']),
+            # Matches the user list's default cursor ordering
+            models.Index(fields=['first_name', 'last_name', 'id'], name='user_name_order'),
+            # Trigram indexes for the user list search; icontains compiles to
+            # UPPER(column) LIKE UPPER('%term%') on PostgreSQL
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm'),
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+            GinIndex(OpClass(Upper('employee_id'), name='gin_trgm_ops'), name='user_employee_id_trgm'),
         ]
 
     def __str__(self):
         return self.get_full_name() or self.email
 
     def save(self, *args, **kwargs):
-        """Override save to create related profile objects."""
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
+        """Override save to sync the cached role name and create related profile objects."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'role' in update_fields:
+            self.role_name_cache = self.role.name if self.role_id else ''
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'role_name_cache'}
 
-        # Create default profile and compliance settings for new users
-        if is_new:
-            if not self.profile:
-                profile = UserProfile.objects.create()
-                self.profile = profile
-                self.save(update_fields=['profile'])
+        if self.pk is not None:
+            super().save(*args, **kwargs)
+            return
 
-            if not self.compliance_settings:
-                compliance_settings = ComplianceSettings.objects.create()
-                self.compliance_settings = compliance_settings
-                self.save(update_fields=['compliance_settings'])
+        # Create default profile and compliance settings for new users
+        # before the insert, so the user row is written once with both links
+        with transaction.atomic():
+            if not self.profile_id:
+                self.profile = UserProfile.objects.create()
+
+            if not self.compliance_settings_id:
+                self.compliance_settings = ComplianceSettings.objects.create()
+
+            super().save(*args, **kwargs)
+
+    def get_or_create_settings(self, field_name):
+        """
+        Get the profile or compliance settings row, creating it if missing.
+
+        The user row is locked while checking so concurrent requests link a
+        single row, and only the link column is written.
+        """
+        if getattr(self, f'{field_name}_id') is None:
+            model = self._meta.get_field(field_name).related_model
+            with transaction.atomic():
+                locked = User.objects.select_for_update().only(field_name).get(pk=self.pk)
+                if getattr(locked, f'{field_name}_id') is None:
+                    setattr(locked, field_name, model.objects.create())
+                    locked.save(update_fields=[field_name])
+                setattr(self, field_name, getattr(locked, field_name))
+
+        return getattr(self, field_name)
 
     @property
     def role_name(self):
@@ -274,42 +316,81 @@ class User(AbstractUser):
 
     def has_role(self, role_name):
         """Check if user has specific role."""
-        return self.role and self.role.name == role_name
+        return self.role_id is not None and self.role_name_cache == role_name
 
     def has_any_role(self, role_names):
         """Check if user has any of the specified roles."""
-        return self.role and self.role.name in role_names
+        return self.role_id is not None and self.role_name_cache in role_names
 
     def can_manage_user(self, other_user):
         """Check if user can manage another user."""
-        if not self.role:
+        if not self.role_id:
             return False
 
         # Global admin can manage all users
-        if self.role.name == Role.GLOBAL_ADMIN:
+        if self.has_role(Role.GLOBAL_ADMIN):
             return True
 
         # Admin can manage users in same organization
-        if self.role.name == Role.ADMIN and self.organization == other_user.organization:
+        if self.has_role(Role.ADMIN) and self.organization_id == other_user.organization_id:
             return True
 
         # Manager can manage direct reports
-        if self.role.name in [Role.MANAGER, Role.TEAM_LEAD]:
-            return other_user.manager == self or other_user in self.get_all_reports()
+        if self.has_any_role([Role.MANAGER, Role.TEAM_LEAD]):
+            return (
+                other_user.manager_id == self.pk
+                or self.get_all_reports().filter(pk=other_user.pk).exists()
+            )
 
         return False
 
+    def get_managed_user_ids(self):
+        """
+        Get ids of all users this user can manage.
+
+        Mirrors ``can_manage_user`` so callers checking many users can
+        compute the set once and test membership instead.
+        """
+        if not self.role_id:
+            return set()
+
+        if self.has_role(Role.GLOBAL_ADMIN):
+            return set(User.objects.values_list('id', flat=True))
+
+        if self.has_role(Role.ADMIN):
+            return set(
+                User.objects.filter(organization=self.organization_id).values_list('id', flat=True)
+            )
+
+        if self.has_any_role([Role.MANAGER, Role.TEAM_LEAD]):
+            managed_ids = set(self.direct_reports.values_list('id', flat=True))
+            managed_ids.update(self.get_all_reports().values_list('id', flat=True))
+            return managed_ids
+
+        return set()
+
     def get_all_reports(self):
-        """Get all direct and indirect reports."""
-        reports = []
-        for direct_report in self.direct_reports.filter(is_active=True, is_deleted=False):
-            reports.append(direct_report)
-            reports.extend(direct_report.get_all_reports())
-        return reports
+        """
+        Get all direct and indirect reports.
+
+        The reporting tree is walked in one recursive CTE instead of a query
+        per manager; inactive or deleted users end their branch.
+        """
+        table = connection.ops.quote_name(User._meta.db_table)
+        report_ids = RawSQL(
+            f"WITH RECURSIVE reports(id) AS ("
+            f"SELECT id FROM {table} WHERE manager_id = %s AND is_active = %s AND is_deleted = %s "
+            f"UNION "
+            f"SELECT u.id FROM {table} u JOIN reports r ON u.manager_id = r.id "
+            f"WHERE u.is_active = %s AND u.is_deleted = %s"
+            f") SELECT id FROM reports",
+            [self.pk, True, False, True, False]
+        )
+        return User.objects.filter(id__in=report_ids)
 
     def get_accessible_organizations(self):
         """Get all organizations user has access to."""
-        if self.role and self.role.name == Role.GLOBAL_ADMIN:
+        if self.has_role(Role.GLOBAL_ADMIN):
             from apps.organizations.models import Organization
             return Organization.objects.filter(is_active=True, is_deleted=False)
         elif self.organization:
@@ -321,9 +402,9 @@ class User(AbstractUser):
         if not self.organization:
             return []
 
-        if self.role and self.role.name in [Role.ADMIN, Role.GLOBAL_ADMIN]:
+        if self.has_any_role([Role.ADMIN, Role.GLOBAL_ADMIN]):
             return self.organization.get_departments()
-        elif self.role and self.role.name in [Role.MANAGER, Role.TEAM_LEAD]:
+        elif self.has_any_role([Role.MANAGER, Role.TEAM_LEAD]):
             return [self.department] if self.department else []
         return []
 
@@ -10,10 +10,13 @@ This module provides serializers that follow:
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from apps.common.serializers import (
+    CachedFieldsMixin, CompiledRepresentationMixin, UpdateFieldsMixin
+)
 from .models import User, UserProfile, ComplianceSettings, Role
 
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Role serializer.
 
@@ -26,7 +29,7 @@ class RoleSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(UpdateFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     User profile serializer.
 
@@ -44,7 +47,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class ComplianceSettingsSerializer(serializers.ModelSerializer):
+class ComplianceSettingsSerializer(UpdateFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     Compliance settings serializer.
 
@@ -63,15 +66,12 @@ class ComplianceSettingsSerializer(serializers.ModelSerializer):
         ]
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CompiledRepresentationMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     Basic user serializer for general use.
 
     Follows Single Responsibility Principle - only handles basic user data.
     """
-    role_name = serializers.CharField(source='role_name', read_only=True)
-    department_name = serializers.CharField(source='department_name', read_only=True)
-    organization_name = serializers.CharField(source='organization_name', read_only=True)
 
     class Meta:
         model = User
@@ -93,9 +93,6 @@ class UserDetailSerializer(serializers.ModelSerializer):
     profile = UserProfileSerializer(read_only=True)
     compliance_settings = ComplianceSettingsSerializer(read_only=True)
     role = RoleSerializer(read_only=True)
-    role_name = serializers.CharField(source='role_name', read_only=True)
-    department_name = serializers.CharField(source='department_name', read_only=True)
-    organization_name = serializers.CharField(source='organization_name', read_only=True)
 
     class Meta:
         model = User
@@ -109,7 +106,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     User creation serializer with password handling.
 
@@ -136,13 +133,13 @@ class UserCreateSerializer(serializers.ModelSerializer):
         """Create user with hashed password."""
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
+        user = User(**validated_data)
         user.set_password(password)
         user.save()
         return user
 
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(UpdateFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
     """
     User update serializer without sensitive fields.
 
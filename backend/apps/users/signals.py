@@ -0,0 +1,35 @@
+"""
+User signal handlers.
+
+Keeps the cached current user response in sync with user, profile and
+compliance settings writes; invalidation waits for the commit so a
+concurrent read can't cache the old rows again.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_current_user
+from .models import ComplianceSettings, User, UserProfile
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Invalidate the user's cached response once the write commits."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_current_user(user_id))
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=ComplianceSettings)
+def user_settings_changed(sender, instance, **kwargs):
+    """Invalidate the owning user's cached response once the write commits."""
+    lookup = 'profile' if sender is UserProfile else 'compliance_settings'
+    settings_id = instance.pk
+
+    def invalidate():
+        user_ids = User.objects.filter(**{lookup: settings_id}).values_list('pk', flat=True)
+        invalidate_current_user(*user_ids)
+
+    transaction.on_commit(invalidate)
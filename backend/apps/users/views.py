@@ -9,13 +9,21 @@ This module provides user API views that follow:
 """
 
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_orjson_renderer.parsers import ORJSONParser
+from django.core.cache import cache
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
 
-from .models import User, UserProfile, ComplianceSettings
+from .cache import CURRENT_USER_TIMEOUT, current_user_key, response_etag
+from .models import User
 from .serializers import (
     UserSerializer, UserDetailSerializer, UserCreateSerializer,
     UserUpdateSerializer, PasswordChangeSerializer, UserProfileSerializer,
@@ -23,7 +31,51 @@ from .serializers import (
 )
 
 
-class UserListCreateView(generics.ListCreateAPIView):
+class UserAccessQuerySetMixin:
+    """
+    User queryset scoped to the requesting user's role.
+
+    The role picks a single Q filter, so the user views share one query
+    shape and differ only in the relations they join.
+    """
+    related_fields = []
+
+    def get_queryset(self):
+        """Get the accessible users with the related rows the serializer reads."""
+        return self.get_user_queryset().select_related(*self.related_fields)
+
+    def get_user_queryset(self):
+        """Filter users by organization and permissions."""
+        user = self.request.user
+        if not user.organization_id:
+            return User.objects.none()
+
+        return User.objects.filter(self.get_access_filter(user), is_deleted=False)
+
+    def get_access_filter(self, user):
+        """Get the filter of the users the given user can access."""
+        # Global admin can access all users
+        if user.has_role('global_admin'):
+            return Q()
+
+        # Organization admin can access all users in organization
+        if user.has_role('admin'):
+            return Q(organization_id=user.organization_id)
+
+        if user.has_any_role(['manager', 'team_lead']):
+            return Q(organization_id=user.organization_id) & self.get_manager_filter(user)
+
+        # Regular users can only access themselves
+        return Q(id=user.id)
+
+    def get_manager_filter(self, user):
+        """Get the filter of the users a manager or team lead can access."""
+        # Managers can access themselves and their reports; the reports CTE
+        # stays a subquery instead of an id list
+        return Q(id=user.id) | Q(id__in=user.get_all_reports().values('id'))
+
+
+class UserListCreateView(UserAccessQuerySetMixin, generics.ListCreateAPIView):
     """
     List users or create new user.
 
@@ -34,36 +86,31 @@ class UserListCreateView(generics.ListCreateAPIView):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['role', 'department', 'is_active']
     search_fields = ['first_name', 'last_name', 'email', 'employee_id']
-    ordering_fields = ['first_name', 'last_name', 'hire_date', 'created_at']
-    ordering = ['first_name', 'last_name']
+    # Cursor pages can't be positioned on NULLs, so nullable columns aren't sortable
+    ordering_fields = ['first_name', 'last_name', 'created_at']
+    ordering = ['first_name', 'last_name', 'id']
+    # Relations read by the role/department/organization name properties
+    related_fields = ['role', 'department', 'organization']
+    list_only_fields = [
+        'id', 'email', 'first_name', 'last_name', 'role', 'role__name',
+        'organization', 'organization__name', 'department', 'department__name',
+        'employee_id', 'hire_date', 'hourly_rate', 'is_active',
+        'created_at', 'updated_at',
+    ]
 
     def get_queryset(self):
-        """Filter users by organization."""
-        user = self.request.user
-        if not user.organization:
-            return User.objects.none()
-
-        # Global admin can see all users
-        if user.role and user.role.name == 'global_admin':
-            return User.objects.filter(is_deleted=False)
+        """Get the visible users, loading only the listed columns."""
+        queryset = super().get_queryset()
 
-        # Organization admin can see all users in organization
-        if user.role and user.role.name == 'admin':
-            return User.objects.filter(
-                organization=user.organization,
-                is_deleted=False
-            )
+        # Load only the columns UserSerializer reads for lists
+        if self.request.method == 'GET':
+            queryset = queryset.only(*self.list_only_fields)
 
-        # Managers can see their direct reports and same department
-        if user.role and user.role.name in ['manager', 'team_lead']:
-            return User.objects.filter(
-                organization=user.organization,
-                department=user.department,
-                is_deleted=False
-            )
+        return queryset
 
-        # Regular users can only see themselves
-        return User.objects.filter(id=user.id, is_deleted=False)
+    def get_manager_filter(self, user):
+        """Managers and team leads can list their whole department."""
+        return Q(department_id=user.department_id)
 
     def get_serializer_class(self):
         """Use different serializer for creation."""
@@ -72,7 +119,7 @@ class UserListCreateView(generics.ListCreateAPIView):
         return UserSerializer
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(UserAccessQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete user.
 
@@ -80,37 +127,8 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = UserDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
-
-    def get_queryset(self):
-        """Filter users by organization and permissions."""
-        user = self.request.user
-        if not user.organization:
-            return User.objects.none()
-
-        # Global admin can access all users
-        if user.role and user.role.name == 'global_admin':
-            return User.objects.filter(is_deleted=False)
-
-        # Organization admin can access all users in organization
-        if user.role and user.role.name == 'admin':
-            return User.objects.filter(
-                organization=user.organization,
-                is_deleted=False
-            )
-
-        # Managers can access their direct reports
-        if user.role and user.role.name in ['manager', 'team_lead']:
-            manageable_users = [user.id] + [
-                report.id for report in user.get_all_reports()
-            ]
-            return User.objects.filter(
-                id__in=manageable_users,
-                organization=user.organization,
-                is_deleted=False
-            )
-
-        # Regular users can only access themselves
-        return User.objects.filter(id=user.id, is_deleted=False)
+    # Relations read by the name properties and the nested serializers
+    related_fields = ['role', 'department', 'organization', 'profile', 'compliance_settings']
 
     def get_serializer_class(self):
         """Use different serializer for updates."""
@@ -122,7 +140,7 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         """Soft delete user."""
         instance.is_active = False
         instance.is_deleted = True
-        instance.save()
+        instance.save(update_fields=['is_active', 'is_deleted', 'updated_at'])
 
 
 @api_view(['GET'])
@@ -133,11 +151,32 @@ def current_user(request):
 
     Follows Single Responsibility Principle - only handles current user data.
     """
-    serializer = UserDetailSerializer(request.user)
-    return Response(serializer.data)
+    key = current_user_key(request.user.pk)
+    cached = cache.get(key)
+
+    if cached is None:
+        # Reload with the relations the detail serializer reads in one query
+        user = User.objects.select_related(*UserDetailView.related_fields).get(pk=request.user.pk)
+        data = dict(UserDetailSerializer(user).data)
+        cached = (data, response_etag(data))
+        cache.set(key, cached, CURRENT_USER_TIMEOUT)
+
+    data, etag = cached
+
+    # Pollers sending back the last ETag get an empty 304 until the data changes
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
 
 
 @api_view(['PUT', 'PATCH'])
+@parser_classes([ORJSONParser, MultiPartParser])
 @permission_classes([permissions.IsAuthenticated])
 def update_profile(request):
     """
@@ -145,15 +184,8 @@ def update_profile(request):
 
     Follows Single Responsibility Principle - only handles profile updates.
     """
-    user = request.user
-    if not user.profile:
-        # Create profile if it doesn't exist
-        from .models import UserProfile
-        user.profile = UserProfile.objects.create()
-        user.save()
-
     serializer = UserProfileSerializer(
-        user.profile,
+        request.user.get_or_create_settings('profile'),
         data=request.data,
         partial=request.method == 'PATCH'
     )
@@ -172,15 +204,8 @@ def update_compliance_settings(request):
 
     Follows Single Responsibility Principle - only handles compliance settings.
     """
-    user = request.user
-    if not user.compliance_settings:
-        # Create compliance settings if they don't exist
-        from .models import ComplianceSettings
-        user.compliance_settings = ComplianceSettings.objects.create()
-        user.save()
-
     serializer = ComplianceSettingsSerializer(
-        user.compliance_settings,
+        request.user.get_or_create_settings('compliance_settings'),
         data=request.data,
         partial=request.method == 'PATCH'
     )
@@ -229,13 +254,17 @@ def user_stats(request, user_id=None):
     else:
         user = request.user
 
-    # Calculate statistics (placeholder)
-    stats = {
-        'total_hours_this_month': 160.5,
-        'overtime_hours_this_month': 8.5,
-        'projects_count': 3,
-        'approval_rate': 95.0,
-        'attendance_rate': 98.0,
-    }
+    # Import here to avoid circular imports
+    from apps.time_tracking.cache import USER_STATS_TIMEOUT, user_stats_key
+    from apps.time_tracking.models import TimeEntry
+
+    # Month to date, recomputed only after the user's entries change
+    today = timezone.now().date()
+    key = user_stats_key(user.pk, today)
+    stats = cache.get(key)
+
+    if stats is None:
+        stats = TimeEntry.objects.stats_for(user.pk, today.replace(day=1), today)
+        cache.set(key, stats, USER_STATS_TIMEOUT)
 
     return Response(stats)
\ No newline at end of file
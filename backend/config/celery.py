@@ -19,14 +19,18 @@ app = Celery('timetracker')
 # the configuration object to child processes.
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-# Load task modules from all registered Django apps.
-app.autodiscover_tasks()
+# Load task modules from the apps that define them, instead of probing
+# every installed app. Discovery stays lazy: importing the task modules
+# here would load models before Django's app registry is ready.
+app.autodiscover_tasks(['apps.compliance', 'apps.time_tracking'], related_name='tasks')
 
 # Celery beat schedule
 app.conf.beat_schedule = {
+    # Closing a time entry queues its user's check; this only sweeps
+    # writes that skip signals (bulk updates, auto-stopped entries)
     'check-overtime-violations': {
         'task': 'apps.compliance.tasks.check_overtime_violations',
-        'schedule': 60.0,  # Every minute
+        'schedule': 3600.0,  # Every hour
     },
     'send-break-reminders': {
         'task': 'apps.compliance.tasks.send_break_reminders',
@@ -100,6 +100,21 @@ DATABASES = {
     'default': env.db()
 }
 
+# Pool connections across greenlets when served by gevent workers
+if env.bool('DB_GEVENT_POOL', default=False):
+    DATABASES['default']['ENGINE'] = 'django_db_geventpool.backends.postgresql_psycopg2'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        **DATABASES['default'].get('OPTIONS', {}),
+        'MAX_CONNS': env.int('DB_POOL_MAX_CONNS', default=20),
+        'REUSE_CONNS': env.int('DB_POOL_REUSE_CONNS', default=10),
+    }
+else:
+    # Reuse connections across requests instead of reconnecting each time;
+    # a connection is checked before reuse so a dropped one is replaced
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
@@ -122,12 +137,12 @@ AUTH_PASSWORD_VALIDATORS = [
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.OrganizationJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.common.pagination.KeysetCursorPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -135,12 +150,11 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.common.renderers.CompatibleORJSONRenderer',
     ],
+    # The API speaks JSON; views taking uploads add MultiPartParser themselves
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
-        'rest_framework.parsers.MultiPartParser',
-        'rest_framework.parsers.FormParser',
+        'drf_orjson_renderer.parsers.ORJSONParser',
     ],
 }
 
@@ -182,6 +196,17 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Hashed names and gzip/brotli siblings are written at collectstatic, so
+# WhiteNoise serves precompressed, far-future cacheable files
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -202,16 +227,25 @@ CELERY_RESULT_SERIALIZER = 'json'
 # Redis Cache
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': env('REDIS_URL'),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+            # Cached reads fall back to the database while Redis is unavailable
+            'IGNORE_EXCEPTIONS': True,
+            'CONNECTION_POOL_KWARGS': {
+                'max_connections': env.int('REDIS_MAX_CONNECTIONS', default=50),
+                'retry_on_timeout': True,
+            },
         },
         'KEY_PREFIX': 'timetracker',
         'TIMEOUT': 300,
     }
 }
 
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -227,9 +261,10 @@ LOGGING = {
         },
     },
     'handlers': {
+        # Written by a background thread so logging never blocks on disk I/O
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'apps.common.log_handlers.QueuedFileHandler',
             'filename': BASE_DIR / 'logs' / 'django.log',
             'formatter': 'verbose',
         },
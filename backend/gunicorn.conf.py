@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for TimeTracker application.
+
+The API views are I/O bound (a few SQL queries and little Python), so they
+are served by gevent workers by default; set DB_GEVENT_POOL=True so the
+database connections are pooled across a worker's greenlets.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Each greenlet gets its own Django connection, so persistent connections
+# would only pile up under gevent; DB_GEVENT_POOL handles reuse there
+if worker_class == 'gevent':
+    os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative so queries yield to other greenlets."""
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()